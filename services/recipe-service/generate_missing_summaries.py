@@ -4,8 +4,10 @@ Standalone Gemini Summary Generator
 Only generates missing recipe summaries without vector database operations
 """
 
+import asyncio
 import os
 import json
+import re
 import sys
 from pathlib import Path
 from collections import defaultdict
@@ -39,6 +41,42 @@ from google import genai
 CLASSIFICATION_RESULTS_PATH = "function_classification_results/function_classified_recipes.json"
 SUMMARY_CACHE_DIR = "recipe_summaries"
 
+# Response parsing patterns, compiled once instead of on every call.
+# Only the "N." line starts are matched; each section runs from its start to
+# the next one or to the first blank line after its text, whichever comes
+# first, so commentary Gemini adds between or after items is dropped
+NUMBERED_SECTION_START_RE = re.compile(r'^\d+\.', re.MULTILINE)
+NON_SPACE_RE = re.compile(r'\S')
+BLANK_LINE_RE = re.compile(r'\n[ \t]*\n')
+NUMBERED_LINE_RE = re.compile(r'^(\d+)[\.\:\)]\s*(.*)')
+WHITESPACE_RE = re.compile(r'\s+')
+# Matches either a **bold** span or a whitespace run, so cleaning is one pass
+SUMMARY_CLEANUP_RE = re.compile(r'\*\*(.*?)\*\*|\s+', re.DOTALL)
+
+def _cleanup_match(match):
+    """Replace a whitespace run with one space, or unwrap a bold span"""
+    bold_text = match.group(1)
+    if bold_text is None:
+        return ' '
+    return WHITESPACE_RE.sub(' ', bold_text)
+
+def clean_summary_text(text):
+    """Collapse whitespace and remove **bold** markdown from a parsed summary"""
+    return SUMMARY_CLEANUP_RE.sub(_cleanup_match, text.strip())
+
+# Instructions prepended to every batch prompt
+SUMMARY_PROMPT_CONTEXT = (
+    "You are helping build MealMateAI, a semantic search service "
+    "over multiple recipe collections. "
+    "Embedding model used for indexing: all-mpnet-base-v2.\n\n"
+    "Please provide a concise summary for each of the following recipes. "
+    "Format your response as a numbered list with one summary per recipe, "
+    "in the same order as provided:\n\n"
+)
+
+# Maximum Gemini requests in flight across all collections
+GEMINI_MAX_CONCURRENT_REQUESTS = 4
+
 # Collections to process (excluding beverages as requested)
 COLLECTIONS_TO_PROCESS = {
     "desserts-sweets": {"batch_size": 50, "estimated_count": 2465},
@@ -59,6 +97,8 @@ class SummaryGenerator:
     def __init__(self):
         self.genai_client = genai.Client()
         self.classified_recipes = None
+        # Created on first use, inside the event loop that runs the requests
+        self.request_semaphore = None
         print("✅ Gemini GenAI client initialized")
     
     def load_classified_recipes(self):
@@ -79,17 +119,8 @@ class SummaryGenerator:
             print(f"❌ Error loading classification results: {e}")
             return False
     
-    def summarize_recipes_batch(self, recipes_data):
+    async def summarize_recipes_batch(self, recipes_data):
         """Generate summaries for a batch of recipes using Gemini"""
-        context = (
-            "You are helping build MealMateAI, a semantic search service "
-            "over multiple recipe collections. "
-            "Embedding model used for indexing: all-mpnet-base-v2.\n\n"
-            "Please provide a concise summary for each of the following recipes. "
-            "Format your response as a numbered list with one summary per recipe, "
-            "in the same order as provided:\n\n"
-        )
-        
         # Build the batch prompt with all recipes
         recipe_texts = []
         for i, recipe_data in enumerate(recipes_data, 1):
@@ -117,18 +148,21 @@ class SummaryGenerator:
             recipe_texts.append(recipe_text)
         
         # Combine all recipes into one prompt
-        full_prompt = context + "\n\n".join(recipe_texts)
+        full_prompt = SUMMARY_PROMPT_CONTEXT + "\n\n".join(recipe_texts)
         
-        import time
+        # Direct calls outside generate_missing_summaries get the same limit
+        if self.request_semaphore is None:
+            self.request_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
         
         # Retry logic for API overload
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.genai_client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=[full_prompt]
-                )
+                async with self.request_semaphore:
+                    response = await self.genai_client.aio.models.generate_content(
+                        model="gemini-2.5-flash",
+                        contents=[full_prompt]
+                    )
                 
                 # Extract response text
                 response_text = ""
@@ -144,7 +178,7 @@ class SummaryGenerator:
                 if not response_text:
                     if attempt < max_retries - 1:
                         print(f"     ⚠️  Empty response on attempt {attempt + 1}, retrying...")
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
                         continue
                     return [""] * len(recipes_data)
                 
@@ -158,7 +192,7 @@ class SummaryGenerator:
                     if attempt < max_retries - 1:
                         wait_time = (2 ** attempt) * 5  # 5, 10, 20 seconds
                         print(f"     ⚠️  API overloaded (attempt {attempt + 1}/{max_retries}), waiting {wait_time}s...")
-                        time.sleep(wait_time)
+                        await asyncio.sleep(wait_time)
                         continue
                     else:
                         print(f"     ❌ API overloaded after {max_retries} attempts, skipping batch")
@@ -171,20 +205,18 @@ class SummaryGenerator:
         """Parse numbered response into individual summaries"""
         summaries = []
         
-        # Use regex to split by numbered items (1., 2., 3., etc.)
-        import re
-        
-        # Find all numbered sections
-        pattern = r'^(\d+)\.\s*(.*?)(?=^\d+\.|$)'
-        matches = re.findall(pattern, response_text, re.MULTILINE | re.DOTALL)
+        # Split by numbered items (1., 2., 3., etc.) in one linear scan
+        starts = list(NUMBERED_SECTION_START_RE.finditer(response_text))
+        limits = [match.start() for match in starts[1:]] + [len(response_text)]
         
-        for number, content in matches:
-            # Clean up the content
-            cleaned_content = re.sub(r'\n+', ' ', content.strip())  # Replace multiple newlines with spaces
-            cleaned_content = re.sub(r'\s+', ' ', cleaned_content)   # Replace multiple spaces with single space
-            
-            # Remove any markdown formatting like **bold**
-            cleaned_content = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned_content)
+        for start, limit in zip(starts, limits):
+            text_start = NON_SPACE_RE.search(response_text, start.end(), limit)
+            if text_start is None:
+                continue
+            blank_line = BLANK_LINE_RE.search(response_text, text_start.start(), limit)
+            content = response_text[text_start.start():blank_line.start() if blank_line else limit]
+            # Collapse whitespace and remove markdown formatting like **bold**
+            cleaned_content = clean_summary_text(content)
             
             if cleaned_content:
                 summaries.append(cleaned_content)
@@ -204,7 +236,8 @@ class SummaryGenerator:
         """Fallback manual parsing method"""
         summaries = []
         lines = response_text.strip().split('\n')
-        current_summary = ""
+        # Lines of the summary being built; joined once when it is complete
+        current_parts = []
         current_number = 0
         
         for line in lines:
@@ -213,40 +246,129 @@ class SummaryGenerator:
                 continue
                 
             # Check if this line starts with a number pattern like "1." or "1: "
-            import re
-            number_match = re.match(r'^(\d+)[\.\:\)]\s*(.*)', line)
+            number_match = NUMBERED_LINE_RE.match(line)
             
             if number_match:
                 number = int(number_match.group(1))
                 content = number_match.group(2)
                 
                 # Save previous summary if we have one
-                if current_summary and current_number > 0:
-                    # Clean up the summary
-                    cleaned = re.sub(r'\s+', ' ', current_summary.strip())
-                    cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)  # Remove markdown
-                    summaries.append(cleaned)
+                if current_parts and current_number > 0:
+                    summaries.append(clean_summary_text(" ".join(current_parts)))
                 
                 # Start new summary
                 current_number = number
-                current_summary = content
+                current_parts = [content] if content else []
             else:
                 # Continue current summary
-                if current_summary:
-                    current_summary += " " + line
+                if current_parts:
+                    current_parts.append(line)
                 elif line and not line.lower().startswith(('here', 'the following', 'summary')):
                     # Skip introductory text
-                    current_summary = line
+                    current_parts = [line]
         
         # Add the last summary
-        if current_summary and current_number > 0:
-            cleaned = re.sub(r'\s+', ' ', current_summary.strip())
-            cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', cleaned)
-            summaries.append(cleaned)
+        if current_parts and current_number > 0:
+            summaries.append(clean_summary_text(" ".join(current_parts)))
         
         return summaries
     
-    def generate_missing_summaries(self):
+    async def write_summary_files(self, writes):
+        """Write (cache_file, summary) pairs in worker threads, off the event loop"""
+        await asyncio.gather(*[
+            asyncio.to_thread(cache_file.write_text, summary, encoding='utf-8')
+            for cache_file, summary in writes
+        ])
+    
+    async def process_collection(self, collection_name, recipes):
+        """Generate the missing summaries for one collection"""
+        print(f"\n📁 Processing collection: {collection_name}")
+        
+        # Ensure cache folder exists
+        col_cache_dir = Path(SUMMARY_CACHE_DIR) / collection_name
+        col_cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Count existing non-empty summaries
+        existing_files = list(col_cache_dir.glob("*.txt"))
+        existing_names = {summary_file.name for summary_file in existing_files}
+        non_empty_names = set()
+        for summary_file in existing_files:
+            try:
+                content = summary_file.read_text(encoding='utf-8').strip()
+                if content:
+                    non_empty_names.add(summary_file.name)
+            except:
+                pass  # Count as empty if can't read
+        non_empty_summaries = len(non_empty_names)
+        
+        print(f"   📊 {len(recipes)} total recipes")
+        print(f"   ✅ {non_empty_summaries} valid summaries already exist")
+        print(f"   📁 {len(existing_files) - non_empty_summaries} empty summary files found")
+        print(f"   🔄 {len(recipes) - non_empty_summaries} summaries to generate")
+        
+        generated_count = 0
+        skipped_count = non_empty_summaries
+        
+        # Collect recipes that need summaries (missing files or empty files)
+        recipes_needing_summaries = []
+        # Membership checks against the listing above avoid a stat() and a
+        # second read of every summary file
+        for recipe_id, recipe_data in recipes:
+            filename = f"{recipe_id}.txt"
+            if filename in non_empty_names:
+                continue
+            
+            if filename in existing_names:
+                print(f"     🔄 Found empty summary file for recipe {recipe_id}, will regenerate")
+            recipes_needing_summaries.append((recipe_id, recipe_data))
+        
+        # Process in batches
+        config = COLLECTIONS_TO_PROCESS[collection_name]
+        batch_size = config["batch_size"]
+        
+        for i in range(0, len(recipes_needing_summaries), batch_size):
+            batch = recipes_needing_summaries[i:i + batch_size]
+            batch_recipe_data = [recipe_data for _, recipe_data in batch]
+            batch_recipe_ids = [recipe_id for recipe_id, _ in batch]
+            
+            print(f"     🤖 [{collection_name}] Processing batch {i//batch_size + 1}: {len(batch)} recipes...")
+            
+            try:
+                summaries = await self.summarize_recipes_batch(batch_recipe_data)
+                
+                # Save each summary to its cache file
+                writes = []
+                for recipe_id, summary in zip(batch_recipe_ids, summaries):
+                    summary = summary.strip() if summary else ""
+                    if not summary:
+                        print(f"     ⚠️  Empty summary received for recipe {recipe_id}")
+                    # Empty summaries still get a file to mark the recipe as processed
+                    writes.append((col_cache_dir / f"{recipe_id}.txt", summary))
+                
+                await self.write_summary_files(writes)
+                generated_count += sum(1 for _, summary in writes if summary)
+                
+                print(f"     ✅ [{collection_name}] Batch complete: {len(summaries)} summaries generated")
+                    
+            except Exception as e:
+                print(f"     ❌ Error processing batch: {e}")
+                # Fall back to individual processing for this batch
+                print(f"     🔄 Falling back to individual processing...")
+                for recipe_id, recipe_data in batch:
+                    try:
+                        summary = (await self.summarize_recipes_batch([recipe_data]))[0]
+                        await self.write_summary_files([(col_cache_dir / f"{recipe_id}.txt", summary or "")])
+                        if summary:
+                            generated_count += 1
+                    except Exception as individual_e:
+                        print(f"     ❌ Failed individual processing for {recipe_id}: {individual_e}")
+                        continue
+        
+        print(f"   📈 Collection {collection_name}: {generated_count} new summaries generated")
+        
+        return len(recipes), skipped_count, generated_count
+    
+    async def generate_missing_summaries(self):
         """Generate summaries only for recipes that don't have them yet"""
         print("🔄 Generating missing recipe summaries...")
         
@@ -262,102 +384,17 @@ class SummaryGenerator:
         total_skipped = 0
         total_generated = 0
         
-        for collection_name, recipes in recipes_by_collection.items():
-            print(f"\n📁 Processing collection: {collection_name}")
-            
-            # Ensure cache folder exists
-            col_cache_dir = Path(SUMMARY_CACHE_DIR) / collection_name
-            col_cache_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Count existing non-empty summaries
-            existing_files = list(col_cache_dir.glob("*.txt"))
-            non_empty_summaries = 0
-            for summary_file in existing_files:
-                try:
-                    content = summary_file.read_text(encoding='utf-8').strip()
-                    if content:
-                        non_empty_summaries += 1
-                except:
-                    pass  # Count as empty if can't read
-            
-            print(f"   📊 {len(recipes)} total recipes")
-            print(f"   ✅ {non_empty_summaries} valid summaries already exist")
-            print(f"   📁 {len(existing_files) - non_empty_summaries} empty summary files found")
-            print(f"   🔄 {len(recipes) - non_empty_summaries} summaries to generate")
-            
-            generated_count = 0
-            skipped_count = non_empty_summaries
-            
-            # Collect recipes that need summaries (missing files or empty files)
-            recipes_needing_summaries = []
-            for recipe_id, recipe_data in recipes:
-                cache_file = col_cache_dir / f"{recipe_id}.txt"
-                needs_summary = False
-                
-                if not cache_file.exists():
-                    needs_summary = True
-                else:
-                    # Check if file exists but is empty or contains only whitespace
-                    try:
-                        existing_content = cache_file.read_text(encoding='utf-8').strip()
-                        if not existing_content:
-                            needs_summary = True
-                            print(f"     🔄 Found empty summary file for recipe {recipe_id}, will regenerate")
-                    except Exception as e:
-                        print(f"     ⚠️  Error reading existing file for recipe {recipe_id}: {e}")
-                        needs_summary = True
-                
-                if needs_summary:
-                    recipes_needing_summaries.append((recipe_id, recipe_data))
-            
-            # Process in batches
-            config = COLLECTIONS_TO_PROCESS[collection_name]
-            batch_size = config["batch_size"]
-            
-            for i in range(0, len(recipes_needing_summaries), batch_size):
-                batch = recipes_needing_summaries[i:i + batch_size]
-                batch_recipe_data = [recipe_data for _, recipe_data in batch]
-                batch_recipe_ids = [recipe_id for recipe_id, _ in batch]
-                
-                print(f"     🤖 Processing batch {i//batch_size + 1}: {len(batch)} recipes...")
-                
-                try:
-                    summaries = self.summarize_recipes_batch(batch_recipe_data)
-                    
-                    # Save each summary to its cache file
-                    for recipe_id, summary in zip(batch_recipe_ids, summaries):
-                        cache_file = col_cache_dir / f"{recipe_id}.txt"
-                        
-                        if summary and summary.strip():
-                            cache_file.write_text(summary.strip(), encoding='utf-8')
-                            generated_count += 1
-                            total_generated += 1
-                        else:
-                            print(f"     ⚠️  Empty summary received for recipe {recipe_id}")
-                            # Still create an empty file to mark as processed
-                            cache_file.write_text("", encoding='utf-8')
-                    
-                    print(f"     ✅ Batch complete: {len(summaries)} summaries generated")
-                        
-                except Exception as e:
-                    print(f"     ❌ Error processing batch: {e}")
-                    # Fall back to individual processing for this batch
-                    print(f"     🔄 Falling back to individual processing...")
-                    for recipe_id, recipe_data in batch:
-                        try:
-                            summary = self.summarize_recipes_batch([recipe_data])[0]
-                            cache_file = col_cache_dir / f"{recipe_id}.txt"
-                            cache_file.write_text(summary or "", encoding='utf-8')
-                            if summary:
-                                generated_count += 1
-                                total_generated += 1
-                        except Exception as individual_e:
-                            print(f"     ❌ Failed individual processing for {recipe_id}: {individual_e}")
-                            continue
-            
-            print(f"   📈 Collection {collection_name}: {generated_count} new summaries generated")
-            total_processed += len(recipes)
+        # Collections run concurrently; the semaphore caps requests in flight
+        self.request_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
+        results = await asyncio.gather(*[
+            self.process_collection(collection_name, recipes)
+            for collection_name, recipes in recipes_by_collection.items()
+        ])
+        
+        for processed_count, skipped_count, generated_count in results:
+            total_processed += processed_count
             total_skipped += skipped_count
+            total_generated += generated_count
         
         print(f"\n🎉 SUMMARY GENERATION COMPLETE!")
         print("=" * 50)
@@ -380,7 +417,7 @@ def main():
     if not generator.load_classified_recipes():
         return 1
     
-    if not generator.generate_missing_summaries():
+    if not asyncio.run(generator.generate_missing_summaries()):
         return 1
     
     return 0
@@ -20,6 +20,7 @@ This service implements a modern RAG (Retrieval-Augmented Generation) architectu
 
 3. **API Layer**: RESTful FastAPI endpoints
    - /search - Direct semantic search across collections
+   - /search/stream - Direct search streamed as NDJSON while collections answer
    - /recommendations - AI-powered meal suggestions with conversation analysis
    - /collections - Collection management and information
    - /recipes/{id} - Detailed recipe information
@@ -57,11 +58,14 @@ AUTHORS: MealMateAI Development Team
 VERSION: 2.0.0 (AI-Powered with Vector Search)
 """
 
+import logging
 import os
 import sys
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
 from contextlib import asynccontextmanager
 import uvicorn
 import psycopg2
@@ -73,7 +77,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Setup centralized logging system
 from logging_config import setup_logging, log_system_info
-logger = setup_logging("recipe-service-api", level="INFO")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+logger = setup_logging("recipe-service-api", level=LOG_LEVEL)
+# Loggers of the service modules (query generation, vector search, orchestration)
+# write to the API logger's console and log files rather than a second set.
+# Set LOG_LEVEL=DEBUG to include full Gemini prompts and responses.
+services_logger = logging.getLogger("services")
+services_logger.setLevel(logger.level)
+for handler in logger.handlers:
+    services_logger.addHandler(handler)
 
 # Import Pydantic models for request/response validation
 from models import (
@@ -207,6 +219,7 @@ async def lifespan(app: FastAPI):
         logger.warning("🔧 Service will run in basic mode (health checks only)")
         print("⏰ Service initialization timed out (30s)")
         print("🔧 Service will run in basic mode (health checks only)")
+        recommendation_service.shutdown()  # Release the half-initialized instance's threads
         recommendation_service = RecommendationService()  # Create basic instance
     except Exception as e:
         # Any other initialization error
@@ -214,6 +227,8 @@ async def lifespan(app: FastAPI):
         logger.warning("🔧 Service will run in basic mode (health checks only)")
         print(f"❌ Failed to initialize Recipe Service: {e}")
         print("🔧 Service will run in basic mode (health checks only)")
+        if recommendation_service:
+            recommendation_service.shutdown()  # Release the half-initialized instance's threads
         recommendation_service = RecommendationService()  # Create basic instance
     
     yield
@@ -221,8 +236,10 @@ async def lifespan(app: FastAPI):
     # === SHUTDOWN PHASE ===
     logger.info("🛑 Shutting down Recipe Service...")
     print("🛑 Shutting down Recipe Service...")
-    # Note: Cleanup of AI models and connections happens automatically
-    # when the service process terminates
+    if recommendation_service:
+        recommendation_service.shutdown()
+    # Note: AI models and connections are released when the service
+    # process terminates
 
 # === FASTAPI APPLICATION SETUP ===
 
@@ -245,6 +262,8 @@ app = FastAPI(
     """,
     version="2.0.0",
     lifespan=lifespan,
+    # Routes that return dicts or lists are rendered with orjson
+    default_response_class=ORJSONResponse,
     # Automatic OpenAPI documentation available at /docs
     docs_url="/docs",
     redoc_url="/redoc"
@@ -269,6 +288,20 @@ if images_path.exists():
     app.mount("/images", StaticFiles(directory=str(images_path)), name="images")
     logger.info(f"✅ Mounted images directory at /images")
 
+# === RESPONSE ENCODING ===
+
+def model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes
+    
+    Recommendation and search responses carry many recipes with metadata.
+    Returning the model from the route makes FastAPI re-validate it against
+    response_model, convert it to plain Python objects and then run json.dumps.
+    model_dump_json encodes it in one pass in pydantic-core. The route keeps
+    its response_model, so the OpenAPI schema is unchanged.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 # === DEPENDENCY INJECTION ===
 
 async def get_recommendation_service():
@@ -435,7 +468,7 @@ async def get_recommendations(
         logger.info(f"Recommendations request: {len(request.conversation_history)} messages, max_results={request.max_results}")
         result = await service.get_recommendations(request)
         logger.info(f"Recommendations returned: {result.total_results} results")
-        return result
+        return model_response(result)
     except Exception as e:
         logger.error(f"Error generating recommendations: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
@@ -516,17 +549,50 @@ async def direct_search(
         
         logger.info(f"Direct search completed: {len(recommendations)} results in {processing_time}ms")
         
-        return SearchResponse(
+        return model_response(SearchResponse(
             results=recommendations,
             query=request.query,
             collections_searched=collections_searched,
             total_results=len(recommendations),
             processing_time_ms=processing_time
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error performing search: {str(e)}")
 
+@app.post("/search/stream")
+async def direct_search_stream(
+    request: SearchRequest,
+    service: RecommendationService = Depends(get_recommendation_service)
+):
+    """
+    Streaming Direct Search (NDJSON)
+    
+    PURPOSE:
+    ========
+    Same search as POST /search, but each result is written as one JSON line
+    as soon as its collection answers. Clients can render the first recipes
+    while slower collections are still being searched.
+    
+    RESPONSE FORMAT:
+    ================
+    application/x-ndjson, one RecipeRecommendation per line, in arrival order.
+    A line is only sent if the recipe is in the running top max_results.
+    Clients that need the final ranking sort by similarity_score and keep the
+    best max_results.
+    """
+    logger.info(f"Streaming search request: '{request.query}', collections={request.collections}, max_results={request.max_results}")
+    
+    async def ndjson_lines():
+        async for rec in service.direct_search_stream(
+            query=request.query,
+            collections=request.collections,
+            max_results=request.max_results
+        ):
+            yield rec.model_dump_json() + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 @app.post("/collections/{collection_name}/search", response_model=SearchResponse)
 async def search_collection(
     collection_name: str,
@@ -548,13 +614,13 @@ async def search_collection(
         
         processing_time = int((time.time() - start_time) * 1000)
         
-        return SearchResponse(
+        return model_response(SearchResponse(
             results=recommendations,
             query=request.query,
             collections_searched=[collection_name],
             total_results=len(recommendations),
             processing_time_ms=processing_time
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching collection {collection_name}: {str(e)}")
@@ -948,5 +1014,5 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8001,
         reload=True,
-        log_level="info"
+        log_level=LOG_LEVEL.lower()
     )
\ No newline at end of file
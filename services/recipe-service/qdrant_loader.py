@@ -8,8 +8,9 @@ import os
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set
 
 # Set environment variables before imports
 os.environ['TRANSFORMERS_NO_TF'] = '1'
@@ -28,7 +29,13 @@ except ImportError as e:
 CLASSIFICATION_RESULTS_PATH = "function_classification_results/function_classified_recipes.json"
 SUMMARY_CACHE_DIR = "recipe_summaries"
 QDRANT_URL = "http://localhost:6333"
+# gRPC skips the REST/JSON encoding of every 768-float vector on upsert
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 VECTOR_SIZE = 768  # all-mpnet-base-v2 embedding dimensions
+# Upper bound on threads reading a batch's summary files concurrently; a
+# collection never uses more threads than it has recipes per batch
+SUMMARY_READ_WORKERS = int(os.getenv("SUMMARY_READ_WORKERS", "16"))
 
 # 8 Collections to create (excluding beverages)
 COLLECTIONS_CONFIG = {
@@ -96,6 +103,7 @@ class QdrantLoader:
         print("=" * 50)
         print(f"🔧 Configuration:")
         print(f"   QDRANT_URL: {QDRANT_URL}")
+        print(f"   QDRANT_PREFER_GRPC: {QDRANT_PREFER_GRPC} (port {QDRANT_GRPC_PORT})")
         print(f"   VECTOR_SIZE: {VECTOR_SIZE}")
         print(f"   Collections to load: {len(COLLECTIONS_CONFIG)}")
         print()
@@ -103,7 +111,11 @@ class QdrantLoader:
         # Initialize Qdrant client
         print(f"🔌 Connecting to Qdrant at {QDRANT_URL}...")
         try:
-            self.client = QdrantClient(url=QDRANT_URL)
+            self.client = QdrantClient(
+                url=QDRANT_URL,
+                prefer_grpc=QDRANT_PREFER_GRPC,
+                grpc_port=QDRANT_GRPC_PORT
+            )
             # Test connection
             collections = self.client.get_collections()
             print(f"✅ Connected to Qdrant (found {len(collections.collections)} existing collections)")
@@ -199,12 +211,13 @@ class QdrantLoader:
                 print(f"   ❌ Error creating collection '{collection_name}': {e}")
                 return False
     
-    def load_recipe_summary(self, recipe_id: str, collection_name: str) -> Optional[str]:
+    def load_recipe_summary(self, recipe_id: str, collection_name: str, existing_files: Set[str]) -> Optional[str]:
         """Load recipe summary from cache"""
-        summary_file = Path(SUMMARY_CACHE_DIR) / collection_name / f"{recipe_id}.txt"
+        filename = f"{recipe_id}.txt"
+        summary_file = Path(SUMMARY_CACHE_DIR) / collection_name / filename
         
         try:
-            if summary_file.exists():
+            if filename in existing_files:
                 content = summary_file.read_text(encoding='utf-8').strip()
                 if content:
                     return content
@@ -218,13 +231,16 @@ class QdrantLoader:
             print(f"     ❌ Error reading summary for recipe {recipe_id}: {e}")
             return None
     
-    def generate_embedding(self, text: str) -> Optional[List[float]]:
-        """Generate embedding for text"""
+    def generate_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Generate embeddings for a batch of texts in a single encode call"""
+        if not texts:
+            return []
+        
         try:
-            embedding = self.model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
+            embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+            return embeddings.tolist()
         except Exception as e:
-            print(f"     ❌ Error generating embedding: {e}")
+            print(f"     ❌ Error generating embeddings: {e}")
             return None
     
     def load_collection_data(self, collection_name: str) -> bool:
@@ -278,84 +294,96 @@ class QdrantLoader:
         skipped_count = 0
         total_batches = (len(collection_recipes) + batch_size - 1) // batch_size
         
-        for i in range(0, len(collection_recipes), batch_size):
-            batch = collection_recipes[i:i + batch_size]
-            batch_num = i//batch_size + 1
-            
-            print(f"   🔄 Processing batch {batch_num}/{total_batches}: {len(batch)} recipes...")
-            
-            # Prepare batch data
-            points = []
-            batch_skipped = 0
-            
-            for j, (recipe_id, recipe_data) in enumerate(batch):
-                # Progress indicator for large batches
-                if len(batch) >= 50 and j % 25 == 0 and j > 0:
-                    print(f"     ⏳ Progress: {j}/{len(batch)} recipes processed...")
+        # One directory listing replaces a stat() per recipe when reading summaries
+        try:
+            with os.scandir(Path(SUMMARY_CACHE_DIR) / collection_name) as entries:
+                existing_files = {entry.name for entry in entries}
+        except FileNotFoundError:
+            existing_files = set()
+        
+        read_workers = max(1, min(SUMMARY_READ_WORKERS, batch_size))
+        with ThreadPoolExecutor(max_workers=read_workers) as read_pool:
+            for i in range(0, len(collection_recipes), batch_size):
+                batch = collection_recipes[i:i + batch_size]
+                batch_num = i//batch_size + 1
                 
-                # Load summary
-                summary = self.load_recipe_summary(recipe_id, collection_name)
-                if not summary:
-                    batch_skipped += 1
-                    continue
+                print(f"   🔄 Processing batch {batch_num}/{total_batches}: {len(batch)} recipes...")
                 
-                # Generate embedding
-                embedding = self.generate_embedding(summary)
-                if not embedding:
-                    batch_skipped += 1
-                    continue
+                # Prepare batch data
+                points = []
+                batch_skipped = 0
                 
-                # Prepare metadata
-                payload = {
-                    "recipe_id": recipe_id,
-                    "title": str(recipe_data.get('title', ''))[:100],  # Limit title length
-                    "collection": collection_name,
-                    "confidence": recipe_data.get('confidence', 0),
-                    "summary": summary[:500],  # Truncate for storage efficiency
-                    "ingredients_preview": str(recipe_data.get('ingredients', []))[:200],
-                    "instructions_preview": str(recipe_data.get('instructions', ''))[:200]
-                }
+                # Read the batch's summary files concurrently so disk reads overlap
+                summaries = read_pool.map(
+                    lambda item: self.load_recipe_summary(item[0], collection_name, existing_files), batch
+                )
                 
-                # Create point
-                try:
-                    point = rest.PointStruct(
-                        id=int(recipe_id),
-                        vector=embedding,
-                        payload=payload
-                    )
-                    points.append(point)
-                except Exception as e:
-                    print(f"     ⚠️  Error creating point for recipe {recipe_id}: {e}")
-                    batch_skipped += 1
-                    continue
-            
-            # Insert batch into Qdrant
-            if points:
-                try:
-                    print(f"     📤 Inserting {len(points)} vectors into Qdrant...")
-                    self.client.upsert(
-                        collection_name=collection_name,
-                        points=points
-                    )
-                    loaded_count += len(points)
-                    print(f"   ✅ Batch {batch_num} completed: {len(points)} vectors inserted")
-                    
-                    # Brief pause to avoid overwhelming the database
-                    time.sleep(0.2)
+                readable = []
+                for (recipe_id, recipe_data), summary in zip(batch, summaries):
+                    if summary:
+                        readable.append((recipe_id, recipe_data, summary))
+                    else:
+                        batch_skipped += 1
+                
+                # Encode the whole batch at once so the model pads and runs it as
+                # length-sorted mini-batches instead of one forward pass per recipe
+                embeddings = self.generate_embeddings([summary for _, _, summary in readable])
+                if embeddings is None:
+                    batch_skipped += len(readable)
+                    embeddings = []
+                
+                for (recipe_id, recipe_data, summary), embedding in zip(readable, embeddings):
+                    # Prepare metadata
+                    payload = {
+                        "recipe_id": recipe_id,
+                        "title": str(recipe_data.get('title', ''))[:100],  # Limit title length
+                        "collection": collection_name,
+                        "confidence": recipe_data.get('confidence', 0),
+                        "summary": summary[:500],  # Truncate for storage efficiency
+                        "ingredients_preview": str(recipe_data.get('ingredients', []))[:200],
+                        "instructions_preview": str(recipe_data.get('instructions', ''))[:200]
+                    }
                     
-                except Exception as e:
-                    print(f"   ❌ Error inserting batch {batch_num}: {e}")
-                    print(f"      Error details: {type(e).__name__}: {e}")
-                    self.stats["errors"] += 1
-            else:
-                print(f"   ⚠️  Batch {batch_num} skipped: no valid vectors")
-            
-            skipped_count += batch_skipped
-            
-            # Progress summary for large collections
-            if total_batches > 5:
-                progress = (batch_num / total_batches) * 100
-                print(f"   📊 Progress: {progress:.1f}% ({loaded_count} loaded, {skipped_count} skipped)")
+                    # Create point
+                    try:
+                        point = rest.PointStruct(
+                            id=int(recipe_id),
+                            vector=embedding,
+                            payload=payload
+                        )
+                        points.append(point)
+                    except Exception as e:
+                        print(f"     ⚠️  Error creating point for recipe {recipe_id}: {e}")
+                        batch_skipped += 1
+                        continue
+                
+                # Insert batch into Qdrant
+                if points:
+                    try:
+                        print(f"     📤 Inserting {len(points)} vectors into Qdrant...")
+                        self.client.upsert(
+                            collection_name=collection_name,
+                            points=points
+                        )
+                        loaded_count += len(points)
+                        print(f"   ✅ Batch {batch_num} completed: {len(points)} vectors inserted")
+                        
+                        # Brief pause to avoid overwhelming the database
+                        time.sleep(0.2)
+                        
+                    except Exception as e:
+                        print(f"   ❌ Error inserting batch {batch_num}: {e}")
+                        print(f"      Error details: {type(e).__name__}: {e}")
+                        self.stats["errors"] += 1
+                else:
+                    print(f"   ⚠️  Batch {batch_num} skipped: no valid vectors")
+                
+                skipped_count += batch_skipped
+                
+                # Progress summary for large collections
+                if total_batches > 5:
+                    progress = (batch_num / total_batches) * 100
+                    print(f"   📊 Progress: {progress:.1f}% ({loaded_count} loaded, {skipped_count} skipped)")
         
         print(f"   🎉 Collection {collection_name} completed: {loaded_count} loaded, {skipped_count} skipped")
         self.stats["total_loaded"] += loaded_count
@@ -0,0 +1,124 @@
+"""
+Query caches shared by the recommendation pipeline
+
+Generic in-memory caches with no Gemini or Qdrant dependency, so the
+vector search layer and the query generation service can both use them.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+
+import numpy as np
+
+# Semantic cache for generated collection queries: near-identical requests
+# ("high protein dinner" vs "dinner high protein") reuse earlier Gemini output
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MAX_ENTRIES = 256
+SEMANTIC_CACHE_TTL_SECONDS = 600.0
+
+class SemanticQueryCache:
+    """
+    In-memory nearest-neighbour cache keyed by query embeddings
+    
+    Entries are keyed by the unit-normalised embedding of the user's latest
+    message plus an exact key for the preceding conversation. A lookup is a
+    single matrix-vector product over a fixed-size ring buffer. Used for
+    generated collection queries and Qdrant search results.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._matrix = None  # (max_entries, dim) unit vectors, allocated on first store
+        self._entries: List[Optional[Tuple[int, float, Any]]] = [None] * max_entries
+        self._next_slot = 0
+    
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, embedding: Sequence[float], context_key: int) -> Optional[Any]:
+        """Return the cached value for a similar request in the same context"""
+        if self._matrix is None:
+            return None
+        
+        scores = self._matrix @ self._normalize(embedding)
+        candidates = np.flatnonzero(scores >= self.threshold)
+        now = time.monotonic()
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            entry = self._entries[slot]
+            if entry is None:
+                continue
+            entry_key, created_at, queries = entry
+            if entry_key == context_key and now - created_at <= self.ttl_seconds:
+                return queries
+        return None
+    
+    def store(self, embedding: Sequence[float], context_key: int, queries: Any):
+        """Insert an entry, overwriting the oldest one when full"""
+        vector = self._normalize(embedding)
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        
+        self._matrix[self._next_slot] = vector
+        self._entries[self._next_slot] = (context_key, time.monotonic(), queries)
+        self._next_slot = (self._next_slot + 1) % self.max_entries
+
+# Exact-match cache for retried or repeated requests: same user request and
+# same context summary always produce the same prompt, so Gemini is skipped
+EXACT_CACHE_MAX_ENTRIES = 1024
+EXACT_CACHE_TTL_SECONDS = 300.0
+
+class ExactQueryCache:
+    """
+    LRU cache of parsed Gemini results with a per-entry TTL
+    
+    Used for generated collection queries, conversation analyses and whole
+    recommendation responses. Keys are 16-byte blake2b digests of the
+    inputs, so lookups cost one hash and one dict access.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = EXACT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = EXACT_CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(user_request: str, context_summary: str) -> bytes:
+        return hashlib.blake2b(
+            f"{user_request}\x00{context_summary}".encode(),
+            digest_size=16
+        ).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key, dropping it if expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, queries = entry
+        if time.monotonic() - created_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return queries
+    
+    def put(self, key: bytes, queries: Dict[str, Any]):
+        """Insert an entry, evicting the least recently used one when full"""
+        self._entries[key] = (time.monotonic(), queries)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -2,11 +2,23 @@
 Query Generation Service using Google Gemini API
 """
 
+import asyncio
+import logging
 import os
+import random
+import re
 import sys
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import Executor
+from itertools import islice
+from string import Template
+from typing import List, Dict, Any, Optional, Tuple, Callable, Sequence, AsyncIterator, Iterator, Awaitable
 import time
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
 # Security check for API keys
 def check_api_security():
     """Check that API keys are properly secured"""
@@ -21,7 +33,7 @@ def check_api_security():
 
 def log_startup_status():
     """Log detailed startup status for debugging"""
-    print("🚀 Initializing Query Generation Service...")
+    logger.info("🚀 Initializing Query Generation Service...")
     
     # Check API key
     api_valid, api_reason = check_api_security()
@@ -29,27 +41,406 @@ def log_startup_status():
         # Mask the API key for security
         api_key = os.getenv("GOOGLE_API_KEY", "")
         masked_key = f"{api_key[:8]}...{api_key[-4:]}" if len(api_key) > 12 else "***"
-        print(f"✅ GOOGLE_API_KEY: {masked_key} ({api_reason})")
+        logger.info(f"✅ GOOGLE_API_KEY: {masked_key} ({api_reason})")
     else:
-        print(f"❌ GOOGLE_API_KEY: {api_reason}")
-        print("💡 To enable Gemini query generation, set GOOGLE_API_KEY environment variable")
-        print("💡 Format: export GOOGLE_API_KEY='AIzaS...'")
+        logger.error(f"❌ GOOGLE_API_KEY: {api_reason}")
+        logger.info("💡 To enable Gemini query generation, set GOOGLE_API_KEY environment variable")
+        logger.info("💡 Format: export GOOGLE_API_KEY='AIzaS...'")
     
     return api_valid
 
 # Log startup status
 GOOGLE_API_KEY_VALID = log_startup_status()
 
-try:
-    from google import genai
-    GEMINI_AVAILABLE = True
-    print("✅ Google Gemini library imported successfully")
-except ImportError as e:
-    print(f"❌ Google Gemini library import failed: {e}")
-    print("💡 Install with: pip install google-generativeai")
-    GEMINI_AVAILABLE = False
-
 from models import ConversationMessage, AVAILABLE_COLLECTIONS
+from services.query_cache import SemanticQueryCache, ExactQueryCache
+
+# Transient Gemini errors (rate limiting, overload) are retried with jittered
+# exponential backoff before the call counts as a failure for the cool-down
+GEMINI_MAX_ATTEMPTS = 3
+GEMINI_RETRY_BASE_SECONDS = 0.5
+GEMINI_RETRY_MAX_SECONDS = 4.0
+TRANSIENT_GEMINI_ERROR_MARKERS = ("429", "503", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "overloaded")
+
+def is_transient_gemini_error(error: Exception) -> bool:
+    """Whether a Gemini error is worth retrying"""
+    if getattr(error, "code", None) in (429, 503):
+        return True
+    message = str(error)
+    return any(marker in message for marker in TRANSIENT_GEMINI_ERROR_MARKERS)
+
+def gemini_retry_delay(attempt: int) -> float:
+    """Full-jitter backoff delay before retry number `attempt` (0-based)"""
+    return random.uniform(0, min(GEMINI_RETRY_MAX_SECONDS, GEMINI_RETRY_BASE_SECONDS * (2 ** attempt)))
+
+# Importing google.genai and building its client take a second or two, so
+# both run in a background thread that RecommendationService.initialize()
+# starts before loading the embedding model and connecting to Qdrant. No
+# request is sent during warm-up; a ping would spend API quota on every start.
+# Kept below main.py's 30 s startup timeout, so a slow warm-up leaves the
+# service running on fallback queries instead of failing initialization
+GEMINI_WARMUP_TIMEOUT_SECONDS = 20.0
+GEMINI_AVAILABLE = False
+_gemini_client = None
+_gemini_client_error: Optional[Exception] = None
+_GEMINI_READY = threading.Event()
+_gemini_warmup_lock = threading.Lock()
+_gemini_warmup_started = False
+
+def _warm_up_gemini():
+    """Import google.genai and build the shared client off the main thread"""
+    global GEMINI_AVAILABLE, _gemini_client, _gemini_client_error
+    try:
+        try:
+            from google import genai
+        except ImportError as e:
+            logger.error(f"❌ Google Gemini library import failed: {e}")
+            logger.info("💡 Install with: pip install google-generativeai")
+            return
+        GEMINI_AVAILABLE = True
+        logger.info("✅ Google Gemini library imported successfully")
+        
+        if not GOOGLE_API_KEY_VALID:
+            return
+        try:
+            _gemini_client = genai.Client()
+        except Exception as e:
+            _gemini_client_error = e
+    finally:
+        _GEMINI_READY.set()
+
+def start_gemini_warmup():
+    """Start the background Gemini warm-up; later calls are no-ops"""
+    global _gemini_warmup_started
+    with _gemini_warmup_lock:
+        if _gemini_warmup_started:
+            return
+        _gemini_warmup_started = True
+    threading.Thread(target=_warm_up_gemini, name="gemini-warmup", daemon=True).start()
+
+# The analysis step is simple keyword extraction, so it runs on the smaller,
+# faster model; query generation keeps the full flash model.
+ANALYSIS_MODEL = os.getenv("GEMINI_ANALYSIS_MODEL", "gemini-2.5-flash-lite")
+QUERY_MODEL = os.getenv("GEMINI_QUERY_MODEL", "gemini-2.5-flash")
+
+# Cool-down applied after a failed Gemini call so that, during an outage,
+# subsequent requests go straight to the fallbacks instead of each paying the
+# full request timeout. Doubles on every consecutive failure up to the max.
+GEMINI_COOLDOWN_BASE_SECONDS = 10.0
+GEMINI_COOLDOWN_MAX_SECONDS = 300.0
+
+# Collections the query prompt asks for, in response order. All collections
+# are generated by a single Gemini call; missing ones are filled from
+# FALLBACK_COLLECTION_QUERIES and never trigger per-collection requests.
+COLLECTION_NAMES = tuple(AVAILABLE_COLLECTIONS.keys())
+
+FALLBACK_COLLECTION_QUERIES = {
+    "baked-breads": ("bread recipes", "baked goods"),
+    "quick-light": ("quick meals", "light dishes"),
+    "protein-mains": ("main dishes", "protein meals"),
+    "comfort-cooked": ("comfort food", "slow cooked"),
+    "desserts-sweets": ("desserts", "sweet treats"),
+    "breakfast-morning": ("breakfast", "morning food"),
+    "plant-based": ("vegetarian", "vegan dishes"),
+    "fresh-cold": ("salads", "fresh dishes")
+}
+
+ANALYSIS_PROMPT_TEMPLATE = Template("""
+        Analyze the following conversation to extract food-related information:
+
+        $conversation_text
+
+        Please provide a JSON response with:
+        - detected_preferences: list of food preferences mentioned
+        - detected_restrictions: list of dietary restrictions (vegan, gluten-free, etc.)
+        - meal_context: type of meal or eating occasion (breakfast, lunch, dinner, snack, etc.)
+        - cooking_preferences: cooking methods or difficulty preferences
+        - ingredients_mentioned: specific ingredients mentioned
+        - cuisine_preferences: cuisine types mentioned
+        """)
+
+# Static part of the query generation prompt, sent as the system instruction
+# so the per-request message only carries the user request and context.
+QUERY_SYSTEM_INSTRUCTION = """You write recipe search queries for a vector database.
+For each collection, return exactly 2 specific queries that address the user's request.
+
+Collections:
+- baked-breads: breads, pastries, baked goods
+- quick-light: fast, light meals (salads, wraps, quick dishes)
+- protein-mains: meat, poultry, seafood main dishes
+- comfort-cooked: slow-cooked and braised dishes, stews, comfort food
+- desserts-sweets: sweet treats and desserts
+- breakfast-morning: breakfast items
+- plant-based: vegetarian and vegan dishes
+- fresh-cold: salads and raw, uncooked dishes
+
+Rules:
+- Respect exclusions (e.g. "no salads" means no salad queries).
+- Carry explicit requirements into the queries ("high protein", "low carb", "easy"/"quick"/"simple").
+
+Return every collection name mapped to a list of 2 query strings."""
+
+QUERY_PROMPT_TEMPLATE = Template("""User request: "$user_request"
+
+$context_summary""")
+
+# Keyword tables for the fallback analysis when Gemini is unavailable
+PREFERENCE_KEYWORDS = {
+    "spicy": ("spicy", "hot", "pepper", "chili"),
+    "sweet": ("sweet", "dessert", "candy", "sugar"),
+    "healthy": ("healthy", "nutritious", "diet", "wellness"),
+    "comfort": ("comfort", "cozy", "warm", "hearty")
+}
+
+RESTRICTION_KEYWORDS = {
+    "vegan": ("vegan", "plant-based"),
+    "vegetarian": ("vegetarian", "veggie"),
+    "gluten-free": ("gluten-free", "gluten free", "celiac"),
+    "dairy-free": ("dairy-free", "lactose", "no dairy")
+}
+
+MEAL_KEYWORDS = {
+    "breakfast": ("breakfast", "morning", "brunch"),
+    "lunch": ("lunch", "afternoon"),
+    "dinner": ("dinner", "evening", "supper"),
+    "snack": ("snack", "quick", "light")
+}
+
+def _build_keyword_scanner(*tables: Dict[str, Sequence[str]]) -> Tuple["re.Pattern[str]", Dict[str, frozenset]]:
+    """Compile every keyword into one alternation so the text is scanned in a single pass.
+
+    The pattern sits inside a lookahead so overlapping hits are all reported, and a
+    keyword that starts with a shorter keyword also carries the shorter one's labels,
+    since only the longest alternative is reported at each position.
+    """
+    labels_by_keyword: Dict[str, set] = {}
+    for category, table in enumerate(tables):
+        for label, keywords in table.items():
+            for keyword in keywords:
+                labels_by_keyword.setdefault(keyword, set()).add((category, label))
+
+    for keyword, labels in labels_by_keyword.items():
+        for other, other_labels in labels_by_keyword.items():
+            if other != keyword and keyword.startswith(other):
+                labels |= other_labels
+
+    alternation = "|".join(re.escape(keyword) for keyword in sorted(labels_by_keyword, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+    return pattern, {keyword: frozenset(labels) for keyword, labels in labels_by_keyword.items()}
+
+_KEYWORD_PATTERN, _KEYWORD_LABELS = _build_keyword_scanner(PREFERENCE_KEYWORDS, RESTRICTION_KEYWORDS, MEAL_KEYWORDS)
+
+# Default fallback queries per collection, before keyword customization
+DEFAULT_FALLBACK_QUERIES = {
+    "baked-breads": ("fresh bread recipes", "homemade pastries"),
+    "quick-light": ("quick meal ideas", "light lunch recipes"),
+    "protein-mains": ("main course dishes", "protein-rich meals"),
+    "comfort-cooked": ("comfort food recipes", "hearty stews"),
+    "desserts-sweets": ("sweet treats", "dessert recipes"),
+    "breakfast-morning": ("breakfast ideas", "morning meals"),
+    "plant-based": ("vegetarian recipes", "plant-based meals"),
+    "fresh-cold": ("fresh salads", "cold dishes")
+}
+
+# Fallback overrides applied when the conversation mentions these keywords
+HEALTHY_FALLBACK_QUERIES = {
+    "quick-light": ("healthy quick meals", "nutritious light dishes"),
+    "fresh-cold": ("healthy salads", "fresh vegetable dishes")
+}
+
+SWEET_FALLBACK_QUERIES = {
+    "desserts-sweets": ("sweet desserts", "indulgent treats")
+}
+
+# Every keyword-customized fallback query, for telling them apart from Gemini output
+CUSTOMIZED_FALLBACK_QUERIES = frozenset(
+    query
+    for overrides in (HEALTHY_FALLBACK_QUERIES, SWEET_FALLBACK_QUERIES)
+    for queries in overrides.values()
+    for query in queries
+)
+
+# Every static query the service can fall back to, deduplicated, in table order
+ALL_FALLBACK_QUERIES = tuple(dict.fromkeys(
+    query
+    for table in (DEFAULT_FALLBACK_QUERIES, HEALTHY_FALLBACK_QUERIES, SWEET_FALLBACK_QUERIES, FALLBACK_COLLECTION_QUERIES)
+    for queries in table.values()
+    for query in queries
+))
+
+def recent_messages(
+    conversation_history: Sequence[ConversationMessage],
+    count: int,
+    skip_last: int = 0
+) -> Iterator[ConversationMessage]:
+    """Iterate over the last `count` messages (optionally excluding the final
+    `skip_last`) without copying the history the way a tail slice does"""
+    end = max(0, len(conversation_history) - skip_last)
+    return islice(conversation_history, max(0, end - count), end)
+
+class ConversationWindow(Sequence[ConversationMessage]):
+    """
+    Request-scoped view of a conversation history
+    
+    Behaves like the underlying message list, and additionally caches text
+    derived from it so the analysis and query steps of one request lowercase
+    and join the recent messages only once.
+    """
+    
+    __slots__ = ("history", "_lowered", "_recent_text", "_prompt_blocks")
+    
+    def __init__(self, history: Sequence[ConversationMessage]):
+        self.history = history
+        self._lowered: List[str] = []
+        self._recent_text: Dict[int, str] = {}
+        self._prompt_blocks: Optional[Tuple[str, str]] = None
+    
+    @classmethod
+    def of(cls, conversation_history: Sequence[ConversationMessage]) -> "ConversationWindow":
+        """Wrap a history, reusing it if it already is a window"""
+        if isinstance(conversation_history, cls):
+            return conversation_history
+        return cls(conversation_history)
+    
+    def __len__(self) -> int:
+        return len(self.history)
+    
+    def __getitem__(self, index):
+        return self.history[index]
+    
+    def __iter__(self) -> Iterator[ConversationMessage]:
+        return iter(self.history)
+    
+    def recent_text(self, count: int) -> str:
+        """Lowercased content of the last `count` messages, joined by spaces"""
+        text = self._recent_text.get(count)
+        if text is None:
+            # Each message is lowercased at most once per request
+            if len(self._lowered) < min(count, len(self.history)):
+                self._lowered = [msg.content.lower() for msg in recent_messages(self.history, count)]
+            text = " ".join(self._lowered[-count:]) if count else ""
+            self._recent_text[count] = text
+        return text
+    
+    def prompt_blocks(self) -> Tuple[str, str]:
+        """
+        Formatted conversation (last 10 messages) and the short recent-message
+        tail used in context summaries (last 3), built in one pass
+        """
+        if self._prompt_blocks is None:
+            formatted_lines = []
+            tail_lines = []
+            tail_start = min(len(self.history), 10) - 3
+            for index, msg in enumerate(recent_messages(self.history, 10)):  # Use last 10 messages
+                formatted_lines.append(f"{msg.role.capitalize()}: {msg.content[:300]}")  # Limit content length
+                if index >= tail_start:
+                    tail_lines.append(f"- {msg.role}: {msg.content[:100]}...")
+            self._prompt_blocks = ("\n".join(formatted_lines), "\n".join(tail_lines))
+        return self._prompt_blocks
+
+# Structured-output schemas: Gemini returns bare JSON matching these, so
+# responses are parsed directly without fence stripping or brace scanning.
+# Plain dict schemas are used because collection names contain hyphens.
+_STRING_LIST_SCHEMA = {"type": "ARRAY", "items": {"type": "STRING"}}
+
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "detected_preferences": _STRING_LIST_SCHEMA,
+        "detected_restrictions": _STRING_LIST_SCHEMA,
+        "meal_context": {"type": "STRING", "nullable": True},
+        "cooking_preferences": _STRING_LIST_SCHEMA,
+        "ingredients_mentioned": _STRING_LIST_SCHEMA,
+        "cuisine_preferences": _STRING_LIST_SCHEMA
+    },
+    "required": ["detected_preferences", "detected_restrictions", "meal_context"]
+}
+
+COLLECTION_QUERIES_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {collection: _STRING_LIST_SCHEMA for collection in COLLECTION_NAMES},
+    "required": list(COLLECTION_NAMES)
+}
+
+QUERY_GENERATION_CONFIG = {
+    "system_instruction": QUERY_SYSTEM_INSTRUCTION,
+    "response_mime_type": "application/json",
+    "response_schema": COLLECTION_QUERIES_SCHEMA
+}
+
+# Marks the end of a Gemini response stream handed over from the reader thread
+_STREAM_END = object()
+
+class StreamingObjectParser:
+    """Incrementally split a streamed top-level JSON object into its entries.
+    
+    Text is fed in as it arrives; every `"key": value` pair is returned as
+    soon as the comma or closing brace after it has been seen, so callers can
+    act on early entries before the rest of the object has been generated.
+    Anything before the first `{` (such as a markdown fence) is ignored.
+    """
+    
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._entry_start = 0
+        self.done = False
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of text and return the entries it completed"""
+        # Only the unfinished entry is kept between feeds, and scanning resumes
+        # where the previous feed stopped
+        self._text += chunk
+        completed = []
+        
+        for index in range(self._position, len(self._text)):
+            if self.done:
+                break
+            char = self._text[index]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._entry_start = index + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_entry(index))
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                completed.extend(self._complete_entry(index))
+                self._entry_start = index + 1
+        
+        # Keep only the entry still being read, so the buffer (and the cost of
+        # appending the next chunk) stays bounded by one entry, not the response
+        consumed = self._entry_start if self._depth else len(self._text)
+        self._text = self._text[consumed:]
+        self._entry_start -= consumed
+        self._position = len(self._text)
+        return completed
+    
+    def _complete_entry(self, end: int) -> List[Tuple[str, Any]]:
+        entry = self._text[self._entry_start:end].strip()
+        if not entry:
+            return []
+        try:
+            return list(orjson.loads("{" + entry + "}").items())
+        except ValueError:
+            return []
 
 class QueryGenerationService:
     """
@@ -59,248 +450,446 @@ class QueryGenerationService:
     def __init__(self):
         self.genai_client = None
         self._initialized = False
-        
-        print("🔧 Setting up Gemini client...")
+        # Static part of availability (library, API key, client); fixed once the
+        # warm-up client has been attached
+        self._available = False
+        self._gemini_cooldown_until = 0.0
+        self._gemini_failures = 0
+        self._embed: Optional[Callable[[List[str]], Awaitable[List[List[float]]]]] = None
+        self._executor: Optional[Executor] = None
+        self._query_cache = SemanticQueryCache()
+        self._exact_cache = ExactQueryCache()
+        self._analysis_cache = ExactQueryCache()
+        
+        self._client_attached = False
+        if _GEMINI_READY.is_set():
+            self._attach_client()
+    
+    def _attach_client(self):
+        """Adopt the client built by the background warm-up"""
+        self._client_attached = True
+        logger.info("🔧 Setting up Gemini client...")
         
         if not GEMINI_AVAILABLE:
-            print("❌ Gemini library not available - query generation will use fallbacks")
+            logger.error("❌ Gemini library not available - query generation will use fallbacks")
             return
         
         if not GOOGLE_API_KEY_VALID:
-            print("❌ Invalid API key - query generation will use fallbacks")
+            logger.error("❌ Invalid API key - query generation will use fallbacks")
             return
         
-        try:
-            print("🔗 Connecting to Gemini API...")
-            self.genai_client = genai.Client()
-            self._initialized = True
-            print("✅ Gemini client initialized successfully")
-            print("🎯 Smart query generation enabled!")
-        except Exception as e:
-            print(f"❌ Failed to initialize Gemini client: {e}")
-            print("⚠️ Query generation will use fallbacks")
-            self._initialized = False
+        if _gemini_client is None:
+            logger.error(f"❌ Failed to initialize Gemini client: {_gemini_client_error}")
+            logger.warning("⚠️ Query generation will use fallbacks")
+            return
+        
+        self.genai_client = _gemini_client
+        self._initialized = True
+        self._available = True
+        logger.info("✅ Gemini client initialized successfully")
+        logger.info("🎯 Smart query generation enabled!")
+    
+    def start_warmup(self):
+        """Begin building the Gemini client in the background"""
+        start_gemini_warmup()
+    
+    async def wait_until_ready(self, timeout: float = GEMINI_WARMUP_TIMEOUT_SECONDS) -> bool:
+        """Wait for the background Gemini warm-up without blocking the event loop"""
+        if not self._client_attached:
+            start_gemini_warmup()
+            if await asyncio.to_thread(_GEMINI_READY.wait, timeout):
+                self._attach_client()
+            else:
+                logger.warning(f"⚠️ Gemini warm-up still running after {timeout:.0f}s, using fallbacks until it finishes")
+        return self._available
     
     def is_available(self) -> bool:
         """Check if query generation service is available"""
-        return self._initialized and GEMINI_AVAILABLE and GOOGLE_API_KEY_VALID
+        if not self._client_attached:
+            if not _GEMINI_READY.is_set():
+                return False
+            self._attach_client()
+        if not self._available:
+            return False
+        # Only consult the clock while a failure cool-down is in effect
+        return not self._gemini_cooldown_until or time.monotonic() >= self._gemini_cooldown_until
+    
+    def set_executor(self, executor: Optional[Executor]):
+        """Read streamed Gemini responses on `executor` instead of the default one"""
+        self._executor = executor
+    
+    def set_embedder(self, embed: Callable[[List[str]], Awaitable[List[List[float]]]]):
+        """Enable the semantic query cache using the given async batch text embedder"""
+        self._embed = embed
+    
+    def _record_gemini_success(self):
+        """Close the circuit after a successful Gemini call"""
+        self._gemini_failures = 0
+        self._gemini_cooldown_until = 0.0
+    
+    def _record_gemini_failure(self):
+        """Open the circuit for an exponentially growing cool-down window"""
+        self._gemini_failures += 1
+        cooldown = min(
+            GEMINI_COOLDOWN_BASE_SECONDS * (2 ** (self._gemini_failures - 1)),
+            GEMINI_COOLDOWN_MAX_SECONDS
+        )
+        self._gemini_cooldown_until = time.monotonic() + cooldown
+        logger.warning(f"⏸️ Gemini marked unavailable for {cooldown:.0f}s after {self._gemini_failures} consecutive failure(s)")
+    
+    def _note_gemini_failure(self, error: Exception, failures: Optional[List[Exception]]):
+        """Record a failed Gemini call, or collect it for the caller to record once"""
+        if failures is None:
+            self._record_gemini_failure()
+        else:
+            failures.append(error)
+    
+    async def _generate_text(
+        self,
+        prompt: str,
+        model: str = QUERY_MODEL,
+        config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Send a prompt to Gemini and return the response text"""
+        for attempt in range(GEMINI_MAX_ATTEMPTS):
+            try:
+                # Use the SDK's async client so concurrent requests overlap their
+                # Gemini round-trips instead of blocking the event loop
+                response = await self.genai_client.aio.models.generate_content(
+                    model=model,
+                    contents=[prompt],
+                    config=config
+                )
+                break
+            except Exception as e:
+                if attempt == GEMINI_MAX_ATTEMPTS - 1 or not is_transient_gemini_error(e):
+                    raise
+                delay = gemini_retry_delay(attempt)
+                logger.warning(f"⚠️ Transient Gemini error (attempt {attempt + 1}/{GEMINI_MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+        self._record_gemini_success()
+        
+        if hasattr(response, "text"):
+            return response.text
+        candidates = getattr(response, "candidates", [])
+        if candidates:
+            content = getattr(candidates[0], "content", None)
+            if content and hasattr(content, "text"):
+                return content.text
+        return ""
+    
+    async def _stream_text(
+        self,
+        prompt: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Send a prompt to Gemini and yield the response text as it streams in
+        
+        The SDK reads streamed responses with blocking I/O, even through its
+        async client, so the stream is consumed in a worker thread and handed
+        to the event loop through a queue. Other tasks, such as searches for
+        collections that have already arrived, keep running between chunks.
+        
+        Transient errors are retried only until the first chunk has been
+        yielded; after that a retry would repeat text the caller already has.
+        """
+        for attempt in range(GEMINI_MAX_ATTEMPTS):
+            yielded = False
+            try:
+                async for text in self._read_stream(prompt, config):
+                    yielded = True
+                    yield text
+                break
+            except Exception as e:
+                if yielded or attempt == GEMINI_MAX_ATTEMPTS - 1 or not is_transient_gemini_error(e):
+                    raise
+                delay = gemini_retry_delay(attempt)
+                logger.warning(f"⚠️ Transient Gemini error (attempt {attempt + 1}/{GEMINI_MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+        self._record_gemini_success()
+    
+    async def _read_stream(
+        self,
+        prompt: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Single streamed Gemini call, read in a worker thread
+        
+        The reader stops at its next chunk once this generator is closed or
+        cancelled, instead of draining the rest of the response.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop_reading = threading.Event()
+        
+        def read_stream():
+            try:
+                for chunk in self.genai_client.models.generate_content_stream(
+                    model=QUERY_MODEL,
+                    contents=[prompt],
+                    config=config
+                ):
+                    if stop_reading.is_set():
+                        return
+                    text = getattr(chunk, "text", None)
+                    if text:
+                        loop.call_soon_threadsafe(chunks.put_nowait, text)
+            except Exception as e:
+                if not stop_reading.is_set():
+                    loop.call_soon_threadsafe(chunks.put_nowait, e)
+            else:
+                loop.call_soon_threadsafe(chunks.put_nowait, _STREAM_END)
+        
+        reader = loop.run_in_executor(self._executor, read_stream)
+        try:
+            while True:
+                item = await chunks.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            await reader
+        finally:
+            stop_reading.set()
+    
+    async def analyze_and_generate_queries(
+        self,
+        conversation_history: List[ConversationMessage],
+        on_collection: Optional[Callable[[str, List[str]], None]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        """Run conversation analysis and query generation concurrently
+        
+        The query prompt is built from the conversation itself rather than
+        from the analysis result, so the two Gemini round-trips are
+        independent and only cost one round-trip of wall-clock time.
+        """
+        # Both steps share one window so derived text is computed once
+        window = ConversationWindow.of(conversation_history)
+        failures: List[Exception] = []
+        context_analysis, collection_queries = await asyncio.gather(
+            self.analyze_conversation_context(window, failures=failures),
+            self.generate_collection_queries(window, on_collection=on_collection, failures=failures)
+        )
+        # One request opens the circuit once, even if both of its calls failed
+        if failures:
+            self._record_gemini_failure()
+        return context_analysis, collection_queries
     
     async def analyze_conversation_context(
         self,
-        conversation_history: List[ConversationMessage]
+        conversation_history: List[ConversationMessage],
+        failures: Optional[List[Exception]] = None
     ) -> Dict[str, Any]:
-        """Analyze conversation to extract food preferences and context"""
+        """Analyze conversation to extract food preferences and context
+        
+        If `failures` is given, a Gemini error is appended to it instead of
+        being recorded against the circuit breaker.
+        """
         if not self.is_available():
             return self._fallback_analysis(conversation_history)
         
         # Prepare conversation text for analysis
         conversation_text = self._format_conversation(conversation_history)
         
-        analysis_prompt = f"""
-        Analyze the following conversation to extract food-related information:
-
-        {conversation_text}
-
-        Please provide a JSON response with:
-        - detected_preferences: list of food preferences mentioned
-        - detected_restrictions: list of dietary restrictions (vegan, gluten-free, etc.)
-        - meal_context: type of meal or eating occasion (breakfast, lunch, dinner, snack, etc.)
-        - cooking_preferences: cooking methods or difficulty preferences
-        - ingredients_mentioned: specific ingredients mentioned
-        - cuisine_preferences: cuisine types mentioned
-
-        Return only valid JSON, no additional text.
-        """
+        # The analysis depends only on the formatted conversation, so an
+        # identical conversation skips the Gemini call entirely
+        analysis_key = self._analysis_cache.make_key(ANALYSIS_MODEL, conversation_text)
+        cached_analysis = self._analysis_cache.get(analysis_key)
+        if cached_analysis is not None:
+            logger.info("⚡ Reusing cached conversation analysis")
+            return dict(cached_analysis)
+        
+        analysis_prompt = ANALYSIS_PROMPT_TEMPLATE.substitute(conversation_text=conversation_text)
         
         try:
-            response = self.genai_client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=[analysis_prompt]
-            )
-            
-            response_text = ""
-            if hasattr(response, "text"):
-                response_text = response.text
-            else:
-                candidates = getattr(response, "candidates", [])
-                if candidates:
-                    content = getattr(candidates[0], "content", None)
-                    if content and hasattr(content, "text"):
-                        response_text = content.text
+            # Retry once on the larger model if the small one returns unusable output
+            models = (ANALYSIS_MODEL, QUERY_MODEL) if ANALYSIS_MODEL != QUERY_MODEL else (ANALYSIS_MODEL,)
+            for model in models:
+                response_text = await self._generate_text(
+                    analysis_prompt,
+                    model=model,
+                    config={
+                        "response_mime_type": "application/json",
+                        "response_schema": ANALYSIS_RESPONSE_SCHEMA
+                    }
+                )
+                
+                if response_text:
+                    try:
+                        analysis = orjson.loads(response_text)
+                    except ValueError as e:
+                        logger.error(f"Failed to parse conversation analysis JSON from {model}: {e}")
+                        continue
+                    self._analysis_cache.put(analysis_key, analysis)
+                    return dict(analysis)
             
-            if response_text:
-                import json
-                try:
-                    return json.loads(response_text)
-                except json.JSONDecodeError:
-                    # Try to extract JSON from response
-                    import re
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    if json_match:
-                        return json.loads(json_match.group())
-                    
             return self._fallback_analysis(conversation_history)
             
         except Exception as e:
-            print(f"Error analyzing conversation context: {e}")
+            logger.error(f"Error analyzing conversation context: {e}")
+            self._note_gemini_failure(e, failures)
             return self._fallback_analysis(conversation_history)
     
     async def generate_collection_queries(
         self,
         conversation_history: List[ConversationMessage],
-        context_analysis: Optional[Dict[str, Any]] = None
+        context_analysis: Optional[Dict[str, Any]] = None,
+        on_collection: Optional[Callable[[str, List[str]], None]] = None,
+        failures: Optional[List[Exception]] = None
     ) -> Dict[str, List[str]]:
-        """Generate 2 optimized queries per collection based on conversation context"""
+        """Generate 2 optimized queries per collection based on conversation context
+        
+        All collections are requested in one Gemini call. Collections missing
+        from the response are filled from static fallbacks rather than
+        re-requested, so a query generation never fans out into N calls.
+        
+        The response is streamed; `on_collection` is called with each
+        collection's queries as soon as they are complete so the caller can
+        start searching while Gemini is still generating the rest. Cached and
+        fallback results are only returned, never passed to the callback.
+        
+        `failures` works as in analyze_conversation_context.
+        """
         
-        print("🎯 Generating collection-specific queries...")
-        print(f"🔍 Gemini available: {self.is_available()}")
+        logger.info("🎯 Generating collection-specific queries...")
         
         if not self.is_available():
-            print("⚠️ Gemini not available, using fallback queries")
-            print("💡 Reason: API key missing or Gemini client initialization failed")
+            logger.warning("⚠️ Gemini not available, using fallback queries")
+            logger.info("💡 Reason: API key missing or Gemini client initialization failed")
             return self._fallback_queries(conversation_history)
         
-        if not context_analysis:
-            print("📋 Analyzing conversation context...")
-            context_analysis = await self.analyze_conversation_context(conversation_history)
-        
-        print(f"🎯 Extracted context:")
-        print(f"   • Detected Preferences: {context_analysis.get('detected_preferences', [])}")
-        print(f"   • Detected Restrictions: {context_analysis.get('detected_restrictions', [])}")
-        print(f"   • Meal Context: {context_analysis.get('meal_context', 'None')}")
-        print(f"   • Cooking Preferences: {context_analysis.get('cooking_preferences', [])}")
-        print(f"   • Ingredients Mentioned: {context_analysis.get('ingredients_mentioned', [])}")
-        print(f"   • Cuisine Preferences: {context_analysis.get('cuisine_preferences', [])}")
+        if context_analysis and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🎯 Extracted context:\n"
+                "   • Detected Preferences: %s\n"
+                "   • Detected Restrictions: %s\n"
+                "   • Meal Context: %s\n"
+                "   • Cooking Preferences: %s\n"
+                "   • Ingredients Mentioned: %s\n"
+                "   • Cuisine Preferences: %s",
+                context_analysis.get('detected_preferences', []),
+                context_analysis.get('detected_restrictions', []),
+                context_analysis.get('meal_context', 'None'),
+                context_analysis.get('cooking_preferences', []),
+                context_analysis.get('ingredients_mentioned', []),
+                context_analysis.get('cuisine_preferences', [])
+            )
         
         # Extract the actual user message for better context
         user_request = ""
         if conversation_history:
             user_request = conversation_history[-1].content  # Get the latest user message
         
-        print(f"📝 User Request: '{user_request}'")
-        
-        # Prepare context summary
-        context_summary = self._create_context_summary(context_analysis, conversation_history)
-        
-        query_prompt = f"""
-        IMPORTANT: The user specifically requested: "{user_request}"
-        
-        Context analysis:
-        {context_summary}
-        
-        Generate 2 highly specific search queries for each recipe collection that directly address the user's request. 
-        
-        User wants: {user_request}
-        
-        For EACH collection below, create 2 targeted queries that incorporate the user's specific requirements:
-        
-        Collections:
-        - baked-breads: Baking-focused dishes (breads, pastries, baked goods)
-        - quick-light: Fast preparation and light meals (salads, wraps, quick dishes)  
-        - protein-mains: Meat, poultry, seafood main dishes
-        - comfort-cooked: Slow-cooked and braised dishes (stews, braises, comfort food)
-        - desserts-sweets: All sweet treats and desserts
-        - breakfast-morning: Morning-specific foods (breakfast items)
-        - plant-based: Vegetarian and vegan dishes
-        - fresh-cold: Salads and raw preparations (fresh, uncooked dishes)
-        
-        CRITICAL: If the user said "no salads", do NOT include salad queries.
-        CRITICAL: If the user wants "high protein", include "high protein" in relevant queries.
-        CRITICAL: If the user wants "low carbs", include "low carb" in relevant queries.
-        CRITICAL: If the user wants "easy to cook", include "easy" or "quick" or "simple" in queries.
+        logger.debug("📝 User Request: '%s'", user_request)
         
-        Examples based on user request "{user_request}":
-        - For protein-mains: ["easy high protein chicken recipes", "simple low carb beef dishes"]
-        - For quick-light: ["quick high protein meals", "easy low carb lunch ideas"]
-        - For breakfast-morning: ["high protein low carb breakfast", "easy morning protein meals"]
-        
-        Return as JSON format:
-        {{
-          "baked-breads": ["query1", "query2"],
-          "quick-light": ["query1", "query2"],
-          "protein-mains": ["query1", "query2"],
-          "comfort-cooked": ["query1", "query2"],
-          "desserts-sweets": ["query1", "query2"],
-          "breakfast-morning": ["query1", "query2"],
-          "plant-based": ["query1", "query2"],
-          "fresh-cold": ["query1", "query2"]
-        }}
-        
-        Return ONLY valid JSON, no markdown, no additional text.
-        """
-        
-        print("📝 Constructing enhanced prompt for Gemini...")
-        print("="*80)
-        print("📤 EXACT PROMPT SENT TO GEMINI:")
-        print("="*80)
-        print(query_prompt)
-        print("="*80)
+        # Prepare context summary. Without a prior analysis the raw recent
+        # conversation is used, so this call does not wait on a second
+        # Gemini round-trip.
+        if context_analysis:
+            context_summary = self._create_context_summary(context_analysis, conversation_history)
+        else:
+            context_summary = "Recent conversation:\n" + self._format_conversation(conversation_history)
+        
+        # Exact cache lookup: identical request in an identical context
+        exact_key = self._exact_cache.make_key(user_request, context_summary)
+        cached_queries = self._exact_cache.get(exact_key)
+        if cached_queries is not None:
+            logger.info("⚡ Reusing cached queries for an identical request")
+            return {collection: list(queries) for collection, queries in cached_queries.items()}
+        
+        # Semantic cache lookup: same earlier turns + near-identical request
+        request_embedding = None
+        context_key = hash(tuple((msg.role, msg.content) for msg in recent_messages(conversation_history, 9, skip_last=1)))
+        if self._embed and user_request:
+            try:
+                request_embedding = (await self._embed([user_request]))[0]
+                cached_queries = self._query_cache.lookup(request_embedding, context_key)
+                if cached_queries is not None:
+                    logger.info("⚡ Reusing cached queries for a semantically similar request")
+                    return {collection: list(queries) for collection, queries in cached_queries.items()}
+            except Exception as e:
+                logger.warning(f"⚠️ Semantic query cache unavailable: {e}")
+                request_embedding = None
+        
+        query_prompt = QUERY_PROMPT_TEMPLATE.substitute(
+            user_request=user_request,
+            context_summary=context_summary
+        )
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📤 EXACT PROMPT SENT TO GEMINI:\n%s\n%s\n%s\n%s", "=" * 80, QUERY_SYSTEM_INSTRUCTION, query_prompt, "=" * 80)
         
         try:
-            print("⏳ Sending request to Gemini API...")
-            response = self.genai_client.models.generate_content(
-                model="gemini-2.5-flash", 
-                contents=[query_prompt]
-            )
+            logger.debug("⏳ Sending request to Gemini API...")
+            parser = StreamingObjectParser()
+            streamed_queries: Dict[str, List[str]] = {}
+            response_chunks = []
+            async for chunk in self._stream_text(query_prompt, config=QUERY_GENERATION_CONFIG):
+                response_chunks.append(chunk)
+                for collection, queries in parser.feed(chunk):
+                    if collection in COLLECTION_NAMES and isinstance(queries, list) and collection not in streamed_queries:
+                        streamed_queries[collection] = queries[:2]
+                        if on_collection:
+                            on_collection(collection, streamed_queries[collection])
+            response_text = "".join(response_chunks)
             
-            response_text = ""
-            if hasattr(response, "text"):
-                response_text = response.text
-            else:
-                candidates = getattr(response, "candidates", [])
-                if candidates:
-                    content = getattr(candidates[0], "content", None)
-                    if content and hasattr(content, "text"):
-                        response_text = content.text
-            
-            print("="*80)
-            print("📥 EXACT RESPONSE FROM GEMINI:")
-            print("="*80)
-            print(response_text)
-            print("="*80)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📥 EXACT RESPONSE FROM GEMINI:\n%s\n%s\n%s", "=" * 80, response_text, "=" * 80)
             
             if response_text:
-                import json
                 try:
-                    print("🔄 Parsing Gemini response...")
-                    queries = json.loads(response_text)
+                    logger.debug("🔄 Parsing Gemini response...")
+                    try:
+                        queries = orjson.loads(response_text)
+                    except ValueError as e:
+                        if not streamed_queries:
+                            raise
+                        logger.warning(f"⚠️ Full response did not parse ({e}), keeping {len(streamed_queries)} streamed collections")
+                        queries = streamed_queries
                     # Validate structure
                     if isinstance(queries, dict):
-                        validated_queries = {}
-                        successful_collections = 0
-                        for collection in AVAILABLE_COLLECTIONS.keys():
-                            if collection in queries and isinstance(queries[collection], list):
-                                validated_queries[collection] = queries[collection][:2]  # Limit to 2 queries
-                                successful_collections += 1
-                            else:
-                                print(f"⚠️ Collection '{collection}' missing or invalid in Gemini response, using fallback")
-                                validated_queries[collection] = self._fallback_collection_queries(collection)
+                        missing_collections = [
+                            collection for collection in COLLECTION_NAMES
+                            if not isinstance(queries.get(collection), list)
+                        ]
+                        if missing_collections:
+                            logger.warning(f"⚠️ Collections missing or invalid in Gemini response, using fallback: {missing_collections}")
+                        
+                        # Limit to 2 queries per collection
+                        validated_queries = {
+                            collection: (
+                                queries[collection][:2]
+                                if isinstance(queries.get(collection), list)
+                                else list(FALLBACK_COLLECTION_QUERIES[collection])
+                            )
+                            for collection in COLLECTION_NAMES
+                        }
+                        successful_collections = len(COLLECTION_NAMES) - len(missing_collections)
                         
-                        print(f"✅ Using Gemini-generated queries ({successful_collections}/{len(AVAILABLE_COLLECTIONS)} collections successful)")
+                        logger.info(f"✅ Using Gemini-generated queries ({successful_collections}/{len(COLLECTION_NAMES)} collections successful)")
+                        self._exact_cache.put(exact_key, validated_queries)
+                        if request_embedding is not None:
+                            self._query_cache.store(request_embedding, context_key, validated_queries)
                         return validated_queries
-                except json.JSONDecodeError as e:
-                    print(f"❌ Failed to parse Gemini JSON response: {e}")
-                    print("⚠️ Falling back to default queries")
+                except ValueError as e:
+                    logger.error(f"❌ Failed to parse Gemini JSON response: {e}")
+                    logger.warning("⚠️ Falling back to default queries")
             else:
-                print("❌ Empty response from Gemini")
-                print("⚠️ Falling back to default queries")
+                logger.error("❌ Empty response from Gemini")
+                logger.warning("⚠️ Falling back to default queries")
             
             return self._fallback_queries(conversation_history)
             
         except Exception as e:
-            print(f"❌ Error generating collection queries with Gemini: {e}")
-            print("⚠️ Falling back to default queries due to API error")
+            logger.error(f"❌ Error generating collection queries with Gemini: {e}")
+            self._note_gemini_failure(e, failures)
+            logger.warning("⚠️ Falling back to default queries due to API error")
             return self._fallback_queries(conversation_history)
     
     def _format_conversation(self, conversation_history: List[ConversationMessage]) -> str:
         """Format conversation history for analysis"""
-        formatted_lines = []
-        for msg in conversation_history[-10:]:  # Use last 10 messages
-            role = msg.role.capitalize()
-            content = msg.content[:300]  # Limit content length
-            formatted_lines.append(f"{role}: {content}")
-        
-        return "\n".join(formatted_lines)
+        return ConversationWindow.of(conversation_history).prompt_blocks()[0]
     
     def _create_context_summary(
         self,
@@ -329,59 +918,25 @@ class QueryGenerationService:
             summary_parts.append(f"Cuisine preferences: {', '.join(analysis['cuisine_preferences'])}")
         
         # Add recent conversation context
-        recent_messages = conversation_history[-3:]  # Last 3 messages
-        if recent_messages:
+        if conversation_history:
             summary_parts.append("Recent conversation:")
-            for msg in recent_messages:
-                summary_parts.append(f"- {msg.role}: {msg.content[:100]}...")
+            summary_parts.append(ConversationWindow.of(conversation_history).prompt_blocks()[1])  # Last 3 messages
         
         return "\n".join(summary_parts)
     
     def _fallback_analysis(self, conversation_history: List[ConversationMessage]) -> Dict[str, Any]:
         """Fallback analysis when Gemini is not available"""
         # Simple keyword-based analysis
-        text = " ".join([msg.content.lower() for msg in conversation_history[-5:]])
-        
-        detected_preferences = []
-        detected_restrictions = []
-        meal_context = None
-        
-        # Simple keyword detection
-        preference_keywords = {
-            "spicy": ["spicy", "hot", "pepper", "chili"],
-            "sweet": ["sweet", "dessert", "candy", "sugar"],
-            "healthy": ["healthy", "nutritious", "diet", "wellness"],
-            "comfort": ["comfort", "cozy", "warm", "hearty"]
-        }
-        
-        for pref, keywords in preference_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                detected_preferences.append(pref)
-        
-        # Dietary restrictions
-        restriction_keywords = {
-            "vegan": ["vegan", "plant-based"],
-            "vegetarian": ["vegetarian", "veggie"],
-            "gluten-free": ["gluten-free", "gluten free", "celiac"],
-            "dairy-free": ["dairy-free", "lactose", "no dairy"]
-        }
-        
-        for restriction, keywords in restriction_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                detected_restrictions.append(restriction)
+        text = ConversationWindow.of(conversation_history).recent_text(5)
         
-        # Meal context
-        meal_keywords = {
-            "breakfast": ["breakfast", "morning", "brunch"],
-            "lunch": ["lunch", "afternoon"],
-            "dinner": ["dinner", "evening", "supper"],
-            "snack": ["snack", "quick", "light"]
-        }
+        # Single pass over the text collecting (category, label) hits
+        found = set()
+        for match in _KEYWORD_PATTERN.finditer(text):
+            found |= _KEYWORD_LABELS[match.group(1)]
         
-        for meal, keywords in meal_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                meal_context = meal
-                break
+        detected_preferences = [pref for pref in PREFERENCE_KEYWORDS if (0, pref) in found]
+        detected_restrictions = [restriction for restriction in RESTRICTION_KEYWORDS if (1, restriction) in found]
+        meal_context = next((meal for meal in MEAL_KEYWORDS if (2, meal) in found), None)
         
         return {
             "detected_preferences": detected_preferences,
@@ -394,54 +949,33 @@ class QueryGenerationService:
     
     def _fallback_queries(self, conversation_history: List[ConversationMessage]) -> Dict[str, List[str]]:
         """Generate fallback queries when Gemini is not available"""
-        print("🔄 Generating fallback queries with keyword-based customization...")
+        logger.info("🔄 Generating fallback queries with keyword-based customization...")
         
         # Extract key terms from conversation
-        text = " ".join([msg.content.lower() for msg in conversation_history[-3:]])
-        print(f"📝 Analyzing text for keywords: '{text[:100]}...'")
+        text = ConversationWindow.of(conversation_history).recent_text(3)
+        logger.debug("📝 Analyzing text for keywords: '%s...'", text[:100])
         
         # Default queries for each collection
-        base_queries = {
-            "baked-breads": ["fresh bread recipes", "homemade pastries"],
-            "quick-light": ["quick meal ideas", "light lunch recipes"],
-            "protein-mains": ["main course dishes", "protein-rich meals"],
-            "comfort-cooked": ["comfort food recipes", "hearty stews"],
-            "desserts-sweets": ["sweet treats", "dessert recipes"],
-            "breakfast-morning": ["breakfast ideas", "morning meals"],
-            "plant-based": ["vegetarian recipes", "plant-based meals"],
-            "fresh-cold": ["fresh salads", "cold dishes"]
-        }
+        base_queries = {collection: list(queries) for collection, queries in DEFAULT_FALLBACK_QUERIES.items()}
         
         # Try to customize based on keywords found
         customizations = []
         if "healthy" in text or "diet" in text:
-            base_queries["quick-light"] = ["healthy quick meals", "nutritious light dishes"]
-            base_queries["fresh-cold"] = ["healthy salads", "fresh vegetable dishes"]
+            base_queries.update((collection, list(queries)) for collection, queries in HEALTHY_FALLBACK_QUERIES.items())
             customizations.append("healthy")
         
         if "sweet" in text or "dessert" in text:
-            base_queries["desserts-sweets"] = ["sweet desserts", "indulgent treats"]
+            base_queries.update((collection, list(queries)) for collection, queries in SWEET_FALLBACK_QUERIES.items())
             customizations.append("sweet/dessert")
         
         if customizations:
-            print(f"🎯 Applied keyword customizations: {customizations}")
+            logger.info(f"🎯 Applied keyword customizations: {customizations}")
         else:
-            print("📋 Using default fallback queries (no specific keywords detected)")
+            logger.info("📋 Using default fallback queries (no specific keywords detected)")
         
-        print("⚠️ Using fallback queries instead of Gemini-generated queries")
+        logger.warning("⚠️ Using fallback queries instead of Gemini-generated queries")
         return base_queries
     
     def _fallback_collection_queries(self, collection_name: str) -> List[str]:
         """Generate fallback queries for a specific collection"""
-        fallback_map = {
-            "baked-breads": ["bread recipes", "baked goods"],
-            "quick-light": ["quick meals", "light dishes"],
-            "protein-mains": ["main dishes", "protein meals"],
-            "comfort-cooked": ["comfort food", "slow cooked"],
-            "desserts-sweets": ["desserts", "sweet treats"],
-            "breakfast-morning": ["breakfast", "morning food"],
-            "plant-based": ["vegetarian", "vegan dishes"],
-            "fresh-cold": ["salads", "fresh dishes"]
-        }
-        
-        return fallback_map.get(collection_name, ["recipes", "food"])
\ No newline at end of file
+        return list(FALLBACK_COLLECTION_QUERIES.get(collection_name, ("recipes", "food")))
\ No newline at end of file
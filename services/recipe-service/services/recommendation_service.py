@@ -62,16 +62,61 @@ AUTHORS: MealMateAI Development Team
 VERSION: 2.0.0 (RAG-Enhanced)
 """
 
+import asyncio
+import heapq
+import json
+import logging
+import re
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 from datetime import datetime
 
 from models import (
     ConversationMessage, RecommendationRequest, RecommendationResponse,
-    RecipeRecommendation, QueryAnalysis, CollectionInfo, RecipeDetail
+    RecipeRecommendation, QueryAnalysis, CollectionInfo, RecipeDetail,
+    AVAILABLE_COLLECTIONS
 )
 from services.vector_search_service import VectorSearchService
-from services.query_generation_service import QueryGenerationService
+from services.query_cache import ExactQueryCache
+from services.query_generation_service import (
+    QueryGenerationService,
+    DEFAULT_FALLBACK_QUERIES, CUSTOMIZED_FALLBACK_QUERIES, ALL_FALLBACK_QUERIES
+)
+
+logger = logging.getLogger(__name__)
+
+# Threads for blocking work: Qdrant searches, embeddings, Gemini stream reads and
+# large filter passes. A dedicated pool keeps them from queueing behind other
+# default-executor users.
+BLOCKING_CALL_WORKERS = 32
+
+# Result counts above which user preference filtering runs in a worker thread
+PREFERENCE_FILTER_THREAD_THRESHOLD = 50
+
+# Ingredient terms that exclude a recipe for a dietary restriction. Each
+# restriction is compiled into one case-insensitive alternation so the
+# ingredient text is scanned once rather than once per term.
+NON_VEGAN_TERMS = frozenset({"meat", "chicken", "beef", "pork", "fish", "eggs", "dairy", "milk", "cheese"})
+
+def _exclusion_pattern(terms: frozenset) -> "re.Pattern[str]":
+    """Case-insensitive substring alternation over `terms`, in a stable order"""
+    return re.compile("|".join(map(re.escape, sorted(terms))), re.IGNORECASE)
+
+RESTRICTION_EXCLUSION_PATTERNS = {
+    "vegan": _exclusion_pattern(NON_VEGAN_TERMS)
+}
+
+# Collection metadata only changes on ingestion, so it is served from memory
+# for this long before Qdrant is asked again
+COLLECTIONS_INFO_TTL_SECONDS = 60.0
+
+# Whole-response cache: a repeated conversation with the same request options
+# is answered without Gemini or Qdrant. Matching is exact, because similar
+# conversations can ask for opposite things ("no mushrooms" vs "mushrooms")
+RESPONSE_CACHE_MAX_ENTRIES = 128
+RESPONSE_CACHE_TTL_SECONDS = 300.0
 
 class RecommendationService:
     """
@@ -107,9 +152,22 @@ class RecommendationService:
     """
     
     def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=BLOCKING_CALL_WORKERS, thread_name_prefix="rag-")
         self.vector_service = VectorSearchService()
+        self.vector_service.set_executor(self._executor)
         self.query_service = QueryGenerationService()
+        self.query_service.set_executor(self._executor)
         self._initialized = False
+        self._response_cache = ExactQueryCache(
+            max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=RESPONSE_CACHE_TTL_SECONDS
+        )
+        self._collections_cache: Optional[Tuple[float, List[CollectionInfo]]] = None
+        self._collection_info_cache: Dict[str, Tuple[float, CollectionInfo]] = {}
+        # Pipelines currently running, by exact request key (single-flight)
+        self._inflight: Dict[str, "asyncio.Future[RecommendationResponse]"] = {}
+        # Embeddings of the static fallback queries, computed once at initialize()
+        self._fallback_query_embeddings: Dict[str, List[float]] = {}
     
     async def initialize(self) -> bool:
         """Initialize all sub-services"""
@@ -117,45 +175,138 @@ class RecommendationService:
             return True
         
         try:
+            # Build the Gemini client in the background while the embedding
+            # model loads and Qdrant connects
+            self.query_service.start_warmup()
+            
             # Initialize vector search service
             vector_init_success = await self.vector_service.initialize()
             if not vector_init_success:
-                print("Warning: Vector search service failed to initialize")
+                logger.warning("Warning: Vector search service failed to initialize")
                 return False
             
+            # Fallback queries are fixed strings: embed them once, in one batch,
+            # so degraded (fallback) requests skip the embedding model entirely
+            try:
+                self._fallback_query_embeddings = dict(zip(
+                    ALL_FALLBACK_QUERIES,
+                    await self.vector_service.embed(ALL_FALLBACK_QUERIES)
+                ))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not pre-embed fallback queries: {e}")
+            
+            # Let query generation reuse results for semantically similar requests
+            self.query_service.set_embedder(self.vector_service.embed)
+            
+            # The Gemini client warms up in the background during the steps above
+            await self.query_service.wait_until_ready()
+            
             self._initialized = True
             return True
             
         except Exception as e:
-            print(f"Failed to initialize RecommendationService: {e}")
+            logger.error(f"Failed to initialize RecommendationService: {e}")
             return False
     
+    def shutdown(self):
+        """Stop the worker threads used for blocking Qdrant and embedding calls"""
+        self.vector_service.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     async def get_recommendations(
         self,
         request: RecommendationRequest
     ) -> RecommendationResponse:
-        """Main method to get personalized recipe recommendations"""
+        """Main method to get personalized recipe recommendations
+        
+        Identical requests that arrive while one is already being processed
+        share its result instead of repeating the Gemini and Qdrant work.
+        The shared pipeline runs as its own task, so a caller that
+        disconnects does not cancel it for the others.
+        """
+        flight_key = self._inflight_key(request)
+        flight = self._inflight.get(flight_key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._compute_recommendations(request, flight_key))
+            self._inflight[flight_key] = flight
+            flight.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        else:
+            logger.info("⚡ Joining an identical in-flight recommendation request")
+        return await asyncio.shield(flight)
+    
+    @staticmethod
+    def _inflight_key(request: RecommendationRequest) -> str:
+        """Exact key for a request: full conversation plus request options"""
+        return json.dumps(
+            [
+                [(msg.role, msg.content) for msg in request.conversation_history],
+                request.max_results,
+                request.collections,
+                request.user_preferences
+            ],
+            sort_keys=True,
+            default=str
+        )
+    
+    async def _compute_recommendations(
+        self,
+        request: RecommendationRequest,
+        request_key: str
+    ) -> RecommendationResponse:
+        """Run the RAG pipeline for one request, keyed by its `_inflight_key`"""
         start_time = time.time()
         
         if not self._initialized:
             await self.initialize()
         
         try:
-            # Step 1: Analyze conversation context
-            print("🔍 Analyzing conversation context...")
-            context_analysis = await self.query_service.analyze_conversation_context(
-                request.conversation_history
-            )
+            # Step 0: Serve a cached response for a repeated request
+            cache_key = self._response_cache.make_key(request_key, "")
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                processing_time = int((time.time() - start_time) * 1000)
+                logger.info(f"⚡ Served recommendations from response cache in {processing_time}ms")
+                return cached_response.model_copy(update={
+                    "query_analysis": cached_response.query_analysis.model_copy(
+                        update={"processing_time_ms": processing_time}
+                    )
+                })
             
-            # Step 2: Generate targeted queries for each collection
-            print("🎯 Generating collection-specific queries...")
-            collection_queries = await self.query_service.generate_collection_queries(
-                request.conversation_history,
-                context_analysis
-            )
+            # Steps 1 & 2: Analyze conversation context and generate targeted
+            # queries for each collection (independent Gemini calls, run concurrently).
+            # Collections are searched as soon as their queries stream in, so
+            # retrieval overlaps with the rest of the Gemini response.
+            logger.debug("🔍 Analyzing conversation context and generating collection-specific queries...")
+            search_tasks: Dict[str, asyncio.Task] = {}
+            dispatched_queries: Dict[str, List[str]] = {}
+            # Shared across this request's searches so a query repeated in
+            # several collections is embedded once; seeded with the fallback
+            # query embeddings so those are never re-encoded
+            query_embeddings: Dict[str, List[float]] = dict(self._fallback_query_embeddings)
+            
+            def dispatch_search(collection: str, queries: List[str]):
+                if request.collections and collection not in request.collections:
+                    return
+                dispatched_queries[collection] = queries
+                search_tasks[collection] = asyncio.create_task(
+                    self.vector_service.search_multiple_collections(
+                        {collection: queries},
+                        results_per_query=2,  # 2 results per query to get good variety
+                        embeddings=query_embeddings
+                    )
+                )
+            
+            try:
+                context_analysis, collection_queries = await self.query_service.analyze_and_generate_queries(
+                    request.conversation_history,
+                    on_collection=dispatch_search
+                )
+            except BaseException:
+                for task in search_tasks.values():
+                    task.cancel()
+                raise
             
-            # Check if we got Gemini-generated queries or fallback queries
-            self._log_query_generation_status(collection_queries)
+            generated_queries = collection_queries
             
             # Step 3: Filter collections if specified
             if request.collections:
@@ -166,24 +317,52 @@ class RecommendationService:
                 }
                 collection_queries = filtered_queries
             
-            # Step 4: Execute vector searches
-            print(f"🔍 Searching {len(collection_queries)} collections...")
-            recommendations = await self.vector_service.search_multiple_collections(
-                collection_queries,
-                results_per_query=2  # 2 results per query to get good variety
+            # Step 4: Execute vector searches for collections that were not
+            # streamed (cache hits, fallbacks) or whose final queries differ
+            for collection, queries in collection_queries.items():
+                if dispatched_queries.get(collection) != queries:
+                    if collection in search_tasks:
+                        search_tasks[collection].cancel()
+                    dispatch_search(collection, queries)
+            for collection in set(search_tasks) - set(collection_queries):
+                search_tasks.pop(collection).cancel()
+            
+            # Check if we got Gemini-generated queries or fallback queries.
+            # Logged once the searches are running rather than ahead of them,
+            # and skipped entirely when INFO logging is off.
+            if logger.isEnabledFor(logging.INFO):
+                asyncio.get_running_loop().call_soon(self._log_query_generation_status, generated_queries)
+            
+            logger.debug("🔍 Searching %d collections...", len(collection_queries))
+            search_results = await asyncio.gather(*search_tasks.values())
+            recommendations = self.vector_service.merge_recommendations(
+                rec for results in search_results for rec in results
             )
             
-            # Step 5: Apply additional filtering based on user preferences
+            # Steps 5 & 6: Apply additional filtering based on user preferences
+            # and limit results; only the first max_results matches are kept,
+            # but total_results still counts every recipe that passes the filter
+            total_results = len(recommendations)
             if request.user_preferences:
-                recommendations = self._apply_user_preferences_filter(
-                    recommendations, 
-                    request.user_preferences
-                )
-            
-            # Step 6: Limit results
-            final_recommendations = recommendations[:request.max_results]
+                if len(recommendations) > PREFERENCE_FILTER_THREAD_THRESHOLD:
+                    # Large result sets are filtered off the event loop
+                    final_recommendations, total_results = await self.vector_service.run_blocking(
+                        self._select_recommendations,
+                        recommendations,
+                        request.user_preferences,
+                        request.max_results
+                    )
+                else:
+                    final_recommendations, total_results = self._select_recommendations(
+                        recommendations,
+                        request.user_preferences,
+                        request.max_results
+                    )
+            else:
+                final_recommendations = recommendations[:request.max_results]
             
-            # Step 7: Build response
+            # Step 7: Build response, with full recipe metadata for the returned recipes only
+            final_recommendations = self.vector_service.enrich_recommendations(final_recommendations)
             processing_time = int((time.time() - start_time) * 1000)
             
             # Ensure meal_context is a string, not a list
@@ -200,15 +379,21 @@ class RecommendationService:
                 processing_time_ms=processing_time
             )
             
-            return RecommendationResponse(
+            response = RecommendationResponse(
                 recommendations=final_recommendations,
                 query_analysis=query_analysis,
-                total_results=len(recommendations),
+                total_results=total_results,
                 status="success"
             )
             
+            # Fallback-query results are not cached so Gemini recovery shows up immediately
+            if final_recommendations and self.query_service.is_available():
+                self._response_cache.put(cache_key, response)
+            
+            return response
+            
         except Exception as e:
-            print(f"Error getting recommendations: {e}")
+            logger.error(f"Error getting recommendations: {e}")
             processing_time = int((time.time() - start_time) * 1000)
             
             return RecommendationResponse(
@@ -237,14 +422,14 @@ class RecommendationService:
         
         try:
             if collections:
-                # Search specific collections
-                all_recommendations = []
-                for collection in collections:
-                    recs = await self.vector_service.search_collection(
-                        collection, query, limit=max_results // len(collections)
-                    )
-                    all_recommendations.extend(recs)
-                return sorted(all_recommendations, key=lambda x: x.similarity_score, reverse=True)[:max_results]
+                # Search specific collections; the query is embedded once for all
+                # of them, and results are sorted and deduped by recipe_id so a
+                # recipe found in two collections does not take two slots
+                merged = await self.vector_service.search_multiple_collections(
+                    {collection: [query] for collection in collections},
+                    results_per_query=max_results // len(collections)
+                )
+                return merged[:max_results]
             else:
                 # Search all collections
                 return await self.vector_service.search_all_collections(
@@ -252,9 +437,73 @@ class RecommendationService:
                 )
                 
         except Exception as e:
-            print(f"Error in direct search: {e}")
+            logger.error(f"Error in direct search: {e}")
             return []
     
+    async def direct_search_stream(
+        self,
+        query: str,
+        collections: Optional[List[str]] = None,
+        max_results: int = 10
+    ) -> AsyncIterator[RecipeRecommendation]:
+        """
+        Direct search that yields recommendations as each collection answers
+        
+        Results arrive in completion order, not score order. A recommendation is
+        yielded only if it enters the running top `max_results`. The first results
+        therefore arrive after the fastest collection, not the slowest. Callers that
+        need the final ranking should keep the best `max_results` they receive.
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        if collections:
+            limit = max_results // len(collections)
+        else:
+            collections = list(AVAILABLE_COLLECTIONS.keys())
+            limit = 2
+        
+        # Embed once; every collection is searched with the same vector
+        try:
+            query_vector = (await self.vector_service.embed([query]))[0]
+        except Exception as e:
+            logger.error(f"Error in streaming search: {e}")
+            return
+        tasks = [
+            asyncio.create_task(self.vector_service.search_collection_with_vector(collection, query_vector, limit=limit))
+            for collection in collections
+        ]
+        # Min-heap of (score, -arrival) for the current top results; on equal
+        # scores the earlier arrival stays
+        top: List[Tuple[float, int]] = []
+        seen = set()
+        arrival = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    results = await next_done
+                except Exception as e:
+                    logger.error(f"Error in streaming search: {e}")
+                    continue
+                
+                for rec in sorted(results, key=lambda x: x.similarity_score, reverse=True):
+                    if rec.recipe_id in seen:
+                        continue
+                    entry = (rec.similarity_score, -arrival)
+                    if len(top) < max_results:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+                    else:
+                        # Sorted batch: nothing after this can enter the top either
+                        break
+                    seen.add(rec.recipe_id)
+                    arrival += 1
+                    yield rec
+        finally:
+            for task in tasks:
+                task.cancel()
+    
     async def search_collection(
         self,
         collection_name: str,
@@ -270,7 +519,7 @@ class RecommendationService:
                 collection_name, query, limit=max_results
             )
         except Exception as e:
-            print(f"Error searching collection {collection_name}: {e}")
+            logger.error(f"Error searching collection {collection_name}: {e}")
             return []
     
     async def get_collections_info(self) -> List[CollectionInfo]:
@@ -278,9 +527,14 @@ class RecommendationService:
         if not self._initialized:
             await self.initialize()
         
+        if self._collections_cache and time.monotonic() - self._collections_cache[0] < COLLECTIONS_INFO_TTL_SECONDS:
+            return list(self._collections_cache[1])
+        
         try:
             collections_data = await self.vector_service.get_all_collections_info()
             
+            # One timestamp for the whole listing; all entries were read together
+            fetched_at = datetime.now()
             collection_infos = []
             for data in collections_data:
                 info = CollectionInfo(
@@ -288,14 +542,20 @@ class RecommendationService:
                     description=data["description"],
                     recipe_count=data["recipe_count"],
                     status=data["status"],
-                    last_updated=datetime.now()  # Would be better to track actual updates
+                    last_updated=fetched_at  # Would be better to track actual updates
                 )
                 collection_infos.append(info)
             
-            return collection_infos
+            # Errors are not cached so a recovered Qdrant shows up immediately
+            if all(not info.status.startswith("error") for info in collection_infos):
+                cached_at = time.monotonic()
+                self._collections_cache = (cached_at, collection_infos)
+                self._collection_info_cache.update((info.name, (cached_at, info)) for info in collection_infos)
+            
+            return list(collection_infos)
             
         except Exception as e:
-            print(f"Error getting collections info: {e}")
+            logger.error(f"Error getting collections info: {e}")
             return []
     
     async def get_collection_info(self, collection_name: str) -> Optional[CollectionInfo]:
@@ -303,19 +563,26 @@ class RecommendationService:
         if not self._initialized:
             await self.initialize()
         
+        cached = self._collection_info_cache.get(collection_name)
+        if cached and time.monotonic() - cached[0] < COLLECTIONS_INFO_TTL_SECONDS:
+            return cached[1]
+        
         try:
             data = await self.vector_service.get_collection_info(collection_name)
             
-            return CollectionInfo(
+            info = CollectionInfo(
                 name=data["name"],
                 description=data["description"],
                 recipe_count=data["recipe_count"],
                 status=data["status"],
                 last_updated=datetime.now()
             )
+            if not info.status.startswith("error"):
+                self._collection_info_cache[collection_name] = (time.monotonic(), info)
+            return info
             
         except Exception as e:
-            print(f"Error getting collection info for {collection_name}: {e}")
+            logger.error(f"Error getting collection info for {collection_name}: {e}")
             return None
     
     async def get_recipe_details(self, recipe_id: str) -> Optional[RecipeDetail]:
@@ -341,17 +608,27 @@ class RecommendationService:
             )
             
         except Exception as e:
-            print(f"Error getting recipe details for {recipe_id}: {e}")
+            logger.error(f"Error getting recipe details for {recipe_id}: {e}")
             return None
     
-    def _apply_user_preferences_filter(
+    def _select_recommendations(
+        self,
+        recommendations: List[RecipeRecommendation],
+        preferences: Dict[str, Any],
+        limit: int
+    ) -> Tuple[List[RecipeRecommendation], int]:
+        """First `limit` recommendations passing the preference filter, plus the
+        total number that pass, without building the full filtered list"""
+        matches = self._filter_recommendations(recommendations, preferences)
+        selected = list(islice(matches, limit))
+        return selected, len(selected) + sum(1 for _ in matches)
+    
+    def _filter_recommendations(
         self,
         recommendations: List[RecipeRecommendation],
         preferences: Dict[str, Any]
-    ) -> List[RecipeRecommendation]:
-        """Apply additional filtering based on user preferences"""
-        filtered_recommendations = []
-        
+    ) -> Iterator[RecipeRecommendation]:
+        """Apply additional filtering based on user preferences, lazily"""
         for rec in recommendations:
             # Check dietary restrictions
             if "dietary_restrictions" in preferences:
@@ -359,18 +636,22 @@ class RecommendationService:
                 if isinstance(restrictions, list):
                     # Check if recipe metadata indicates compliance with restrictions
                     # This is a simplified check - in practice, you'd want more sophisticated logic
-                    metadata = rec.metadata.get("original_data", {})
-                    ingredients = metadata.get("ingredients", [])
                     
                     # Simple filtering logic (would need enhancement for production)
                     skip_recipe = False
+                    ingredients_text = None
                     for restriction in restrictions:
-                        if restriction.lower() == "vegan":
-                            # Check for non-vegan ingredients (simplified)
-                            non_vegan = ["meat", "chicken", "beef", "pork", "fish", "eggs", "dairy", "milk", "cheese"]
-                            if any(ing.lower() in str(ingredients).lower() for ing in non_vegan):
-                                skip_recipe = True
-                                break
+                        pattern = RESTRICTION_EXCLUSION_PATTERNS.get(str(restriction).lower())
+                        if pattern is None:
+                            continue
+                        if ingredients_text is None:
+                            # Full ingredients are looked up only when a restriction needs them
+                            recipe_data = self.vector_service.get_classified_recipe(rec.recipe_id) or {}
+                            ingredients_text = str(recipe_data.get("ingredients", []))
+                        # Check for excluded ingredients (simplified)
+                        if pattern.search(ingredients_text):
+                            skip_recipe = True
+                            break
                     
                     if skip_recipe:
                         continue
@@ -389,9 +670,7 @@ class RecommendationService:
                 # Would need cooking time data in metadata to implement this
                 pass
             
-            filtered_recommendations.append(rec)
-        
-        return filtered_recommendations
+            yield rec
     
     async def health_check(self) -> Dict[str, Any]:
         """Check the health of all services"""
@@ -417,28 +696,16 @@ class RecommendationService:
     def _log_query_generation_status(self, collection_queries: Dict[str, List[str]]):
         """Analyze and log whether queries were generated by Gemini or are fallbacks"""
         
-        # Default fallback queries to compare against
-        default_queries = {
-            "baked-breads": ["fresh bread recipes", "homemade pastries"],
-            "quick-light": ["quick meal ideas", "light lunch recipes"],
-            "protein-mains": ["main course dishes", "protein-rich meals"],
-            "comfort-cooked": ["comfort food recipes", "hearty stews"],
-            "desserts-sweets": ["sweet treats", "dessert recipes"],
-            "breakfast-morning": ["breakfast ideas", "morning meals"],
-            "plant-based": ["vegetarian recipes", "plant-based meals"],
-            "fresh-cold": ["fresh salads", "cold dishes"]
-        }
-        
         gemini_collections = 0
         fallback_collections = 0
         customized_collections = []
         
         for collection, queries in collection_queries.items():
-            if collection in default_queries:
-                default_for_collection = default_queries[collection]
-                if queries == default_for_collection:
+            if collection in DEFAULT_FALLBACK_QUERIES:
+                default_for_collection = DEFAULT_FALLBACK_QUERIES[collection]
+                if tuple(queries) == default_for_collection:
                     fallback_collections += 1
-                elif any(query in ["healthy quick meals", "nutritious light dishes", "healthy salads", "fresh vegetable dishes", "sweet desserts", "indulgent treats"] for query in queries):
+                elif any(query in CUSTOMIZED_FALLBACK_QUERIES for query in queries):
                     # These are keyword-customized fallback queries
                     customized_collections.append(collection)
                     fallback_collections += 1
@@ -449,30 +716,32 @@ class RecommendationService:
         total_collections = len(collection_queries)
         
         if gemini_collections > 0:
-            print(f"✅ Using Gemini-generated queries ({gemini_collections}/{total_collections} collections)")
+            logger.info(f"✅ Using Gemini-generated queries ({gemini_collections}/{total_collections} collections)")
             if fallback_collections > 0:
-                print(f"⚠️ {fallback_collections} collections using fallback queries")
+                logger.warning(f"⚠️ {fallback_collections} collections using fallback queries")
         else:
-            print(f"⚠️ Using fallback queries for all collections ({fallback_collections}/{total_collections})")
+            logger.warning(f"⚠️ Using fallback queries for all collections ({fallback_collections}/{total_collections})")
             if customized_collections:
-                print(f"🎯 Keyword-customized fallbacks for: {customized_collections}")
+                logger.info(f"🎯 Keyword-customized fallbacks for: {customized_collections}")
         
         # Log a sample of the actual queries for transparency
-        print("📋 Query Generation Results:")
-        for collection, queries in list(collection_queries.items())[:3]:  # Show first 3 collections
-            status = "🤖 Gemini" if collection not in default_queries or queries != default_queries[collection] else "📋 Fallback"
-            print(f"   {collection}: {queries} {status}")
-            
-            # Show comparison with default for Gemini queries
-            if status == "🤖 Gemini" and collection in default_queries:
-                print(f"     └─ Default would be: {default_queries[collection]}")
-        
-        if len(collection_queries) > 3:
-            print(f"   ... and {len(collection_queries) - 3} more collections")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📋 Query Generation Results:")
+            for collection, queries in list(collection_queries.items())[:3]:  # Show first 3 collections
+                status = "🤖 Gemini" if collection not in DEFAULT_FALLBACK_QUERIES or tuple(queries) != DEFAULT_FALLBACK_QUERIES[collection] else "📋 Fallback"
+                logger.debug(f"   {collection}: {queries} {status}")
+                
+                # Show comparison with default for Gemini queries
+                if status == "🤖 Gemini" and collection in DEFAULT_FALLBACK_QUERIES:
+                    logger.debug(f"     └─ Default would be: {list(DEFAULT_FALLBACK_QUERIES[collection])}")
+            
+            if len(collection_queries) > 3:
+                logger.debug(f"   ... and {len(collection_queries) - 3} more collections")
         
         # Calculate and log quality metrics
-        print(f"📊 Query Generation Quality:")
-        print(f"   • Gemini Success Rate: {(gemini_collections/total_collections)*100:.1f}% ({gemini_collections}/{total_collections})")
-        if customized_collections:
-            print(f"   • Keyword Customizations: {len(customized_collections)} collections")
-        print(f"   • Fallback Usage: {(fallback_collections/total_collections)*100:.1f}% ({fallback_collections}/{total_collections})")
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📊 Query Generation Quality:")
+            logger.debug(f"   • Gemini Success Rate: {(gemini_collections/total_collections)*100:.1f}% ({gemini_collections}/{total_collections})")
+            if customized_collections:
+                logger.debug(f"   • Keyword Customizations: {len(customized_collections)} collections")
+            logger.debug(f"   • Fallback Usage: {(fallback_collections/total_collections)*100:.1f}% ({fallback_collections}/{total_collections})")
\ No newline at end of file
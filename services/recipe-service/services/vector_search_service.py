@@ -2,31 +2,97 @@
 Vector Search Service for Qdrant operations
 """
 
+import ast
+import asyncio
+import functools
+import logging
 import os
 import json
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Iterable, Set, ClassVar
 import time
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
 # Set environment variables before imports
 os.environ['TRANSFORMERS_NO_TF'] = '1'
 
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
     from qdrant_client import QdrantClient
     from qdrant_client.http import models as rest
 except ImportError as e:
-    # Will be logged later when logger is available
-    print(f"Import error: {e}")
+    logger.error(f"Import error: {e}")
     raise
 
 from models import CollectionConfig, AVAILABLE_COLLECTIONS, RecipeRecommendation
+from services.query_cache import SemanticQueryCache
+
+# Upper bound on Qdrant searches in flight at once from this process
+QDRANT_MAX_CONCURRENT_SEARCHES = int(os.getenv("QDRANT_MAX_CONCURRENT_SEARCHES", "8"))
+
+# Talk to Qdrant over gRPC (binary protobuf vectors over HTTP/2) instead of
+# REST/JSON. Off by default: it needs the gRPC port reachable, which the
+# docker-compose network provides but a host-mapped REST port does not.
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+
+# Sentences per forward pass when embedding several queries at once
+EMBEDDING_BATCH_SIZE = 32
+
+# Payload fields read by _create_recommendation; Qdrant returns only these
+RECOMMENDATION_PAYLOAD_FIELDS = [
+    "recipe_id", "title", "summary", "confidence", "ingredients_preview", "instructions_preview"
+]
+
+# Query embeddings kept by exact text, so repeated strings skip the model
+EMBEDDING_CACHE_MAX_ENTRIES = 1024
+
+# How long the embedding worker waits for more requests to join a batch
+EMBEDDING_BATCH_WINDOW_SECONDS = 0.005
+
+# Semantic cache in front of Qdrant: a query vector this close to a recent
+# one, for the same collection and limit, reuses that search's results
+SEARCH_CACHE_THRESHOLD = 0.95
+SEARCH_CACHE_MAX_ENTRIES = 512
+SEARCH_CACHE_TTL_SECONDS = 300.0
+
+# Device for the embedding model ("cuda", "cpu", ...). Unset lets
+# sentence-transformers pick CUDA when it is available.
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None
+
+# Run the embedding model's Linear layers as dynamic int8 on CPU. Query vectors
+# then drift slightly from the fp32 vectors stored in Qdrant, so it is opt-in.
+EMBEDDING_QUANTIZE_INT8 = os.getenv("EMBEDDING_QUANTIZE_INT8", "false").lower() == "true"
+
+def _resolve_future(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+    """Complete a future from the event loop thread, unless its waiter gave up"""
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
 
 class VectorSearchService:
     """
     Service for performing semantic search operations against Qdrant collections
+    
+    The embedding model and the classified-recipe metadata are loaded once
+    per process and shared by every instance.
     """
     
+    _shared_model: ClassVar[Optional["SentenceTransformer"]] = None
+    _shared_classified_recipes: ClassVar[Optional[Dict[str, bytes]]] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    
     def __init__(self, qdrant_url: str = None):
         # Use environment variable if available, fallback to localhost
         if qdrant_url is None:
@@ -36,23 +102,64 @@ class VectorSearchService:
         self.model = None
         self.classified_recipes = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._search_slots = asyncio.Semaphore(QDRANT_MAX_CONCURRENT_SEARCHES)
+        self._executor: Optional[Executor] = None
+        # Embedding calls run on worker threads, so the LRU is lock-protected
+        self._embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        # Requests for the embedding worker thread, started by initialize()
+        self._embedding_requests: Optional[queue.Queue] = None
+        self._search_cache = SemanticQueryCache(
+            threshold=SEARCH_CACHE_THRESHOLD,
+            max_entries=SEARCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=SEARCH_CACHE_TTL_SECONDS
+        )
+    
+    def set_executor(self, executor: Optional[Executor]):
+        """Run blocking Qdrant and embedding calls on `executor`
+        
+        Without one they share the event loop's default executor with every
+        other `asyncio.to_thread` caller in the process.
+        """
+        self._executor = executor
+    
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call in the configured executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
     
     async def initialize(self) -> bool:
-        """Initialize Qdrant client and embedding model"""
+        """Initialize Qdrant client and embedding model
+        
+        Concurrent first calls wait for a single initialization.
+        """
         if self._initialized:
             return True
-            
+        
+        async with self._init_lock:
+            if self._initialized:
+                return True
+            return await self._initialize()
+    
+    async def _initialize(self) -> bool:
+        """Connect to Qdrant and attach the shared model and metadata"""
         try:
             # Initialize Qdrant client
-            self.client = QdrantClient(url=self.qdrant_url)
+            self.client = QdrantClient(
+                url=self.qdrant_url,
+                prefer_grpc=QDRANT_PREFER_GRPC,
+                grpc_port=QDRANT_GRPC_PORT
+            )
             
             # Test connection
             collections = self.client.get_collections()
-            print(f"Connected to Qdrant with {len(collections.collections)} collections")
+            logger.info(f"Connected to Qdrant with {len(collections.collections)} collections")
             
-            # Initialize embedding model
-            self.model = SentenceTransformer("all-mpnet-base-v2")
-            print("Embedding model loaded successfully")
+            # Initialize embedding model (loaded off the event loop)
+            self.model = await self.run_blocking(self._load_shared_model)
+            logger.info("Embedding model loaded successfully")
+            self._start_embedding_worker()
             
             # Load classified recipes metadata
             await self._load_classified_recipes()
@@ -61,31 +168,202 @@ class VectorSearchService:
             return True
             
         except Exception as e:
-            print(f"Failed to initialize VectorSearchService: {e}")
+            logger.error(f"Failed to initialize VectorSearchService: {e}")
             return False
     
     async def _load_classified_recipes(self):
-        """Load classified recipes metadata"""
+        """Load classified recipes metadata
+        
+        Each recipe is kept as its compact JSON encoding and parsed on lookup
+        (see `get_classified_recipe`): one bytes object per recipe takes far less
+        memory for the life of the service than the equivalent nested dicts
+        and lists. NaN values are stored as null.
+        """
         classification_path = Path("function_classification_results/function_classified_recipes.json")
         
         try:
-            with open(classification_path, 'r', encoding='utf-8') as f:
-                self.classified_recipes = json.load(f)
-            print(f"Loaded metadata for {len(self.classified_recipes)} classified recipes")
+            self.classified_recipes = await self.run_blocking(self._load_shared_classified_recipes, classification_path)
+            logger.info(f"Loaded metadata for {len(self.classified_recipes)} classified recipes")
         except Exception as e:
-            print(f"Warning: Could not load classified recipes: {e}")
+            logger.warning(f"Warning: Could not load classified recipes: {e}")
             self.classified_recipes = {}
     
+    @classmethod
+    def _load_shared_classified_recipes(cls, classification_path: Path) -> Dict[str, bytes]:
+        """The process-wide classified-recipe store, reading it on first use"""
+        with cls._shared_lock:
+            if cls._shared_classified_recipes is None:
+                cls._shared_classified_recipes = cls._read_classified_recipes(classification_path)
+            return cls._shared_classified_recipes
+    
+    @staticmethod
+    def _read_classified_recipes(classification_path: Path) -> Dict[str, bytes]:
+        # The file contains bare NaN values, which only the stdlib parser accepts
+        recipes = json.loads(classification_path.read_bytes())
+        # orjson returns its growth buffer as-is; copying trims the slack,
+        # which would otherwise more than double the resident size
+        return {recipe_id: bytes(memoryview(orjson.dumps(recipe_data))) for recipe_id, recipe_data in recipes.items()}
+    
+    def get_classified_recipe(self, recipe_id: str) -> Optional[Dict[str, Any]]:
+        """Classified metadata for one recipe, or None if unknown"""
+        if not self.classified_recipes:
+            return None
+        encoded = self.classified_recipes.get(recipe_id)
+        return orjson.loads(encoded) if encoded is not None else None
+    
+    @classmethod
+    def _load_shared_model(cls) -> "SentenceTransformer":
+        """The process-wide embedding model, loading it on first use"""
+        with cls._shared_lock:
+            if cls._shared_model is None:
+                model = SentenceTransformer("all-mpnet-base-v2", device=EMBEDDING_DEVICE)
+                logger.info(f"Embedding model running on {model.device}")
+                if model.device.type == "cuda":
+                    # Half precision halves the bytes moved per matmul on GPU; the
+                    # output is cast back to fp32 to match the stored vectors
+                    model.half()
+                elif EMBEDDING_QUANTIZE_INT8:
+                    cls._quantize_model(model)
+                cls._shared_model = model
+            return cls._shared_model
+    
+    @staticmethod
+    def _quantize_model(model: "SentenceTransformer"):
+        """Swap the transformer's Linear layers for dynamic int8 ones (CPU only)"""
+        try:
+            from torch.ao.quantization import quantize_dynamic
+        except ImportError as e:
+            logger.warning(f"Warning: int8 quantization unavailable, keeping fp32 model: {e}")
+            return
+        
+        if model.device.type != "cpu":
+            logger.info("Embedding model is not on CPU, skipping int8 quantization")
+            return
+        
+        transformer = model[0]
+        transformer.auto_model = quantize_dynamic(
+            transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Embedding model quantized to dynamic int8")
+    
+    def _start_embedding_worker(self):
+        if self._embedding_requests is not None:
+            return
+        self._embedding_requests = queue.Queue()
+        threading.Thread(
+            target=self._embedding_loop,
+            args=(self._embedding_requests,),
+            name="embedding-batcher",
+            daemon=True
+        ).start()
+    
+    def close(self):
+        """Stop the embedding worker; later embed() calls run on the executor"""
+        requests, self._embedding_requests = self._embedding_requests, None
+        if requests is not None:
+            # None tells the worker to exit after any batch it is building
+            requests.put(None)
+    
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts on the embedding worker, batched with concurrent callers
+        
+        Requests arriving within EMBEDDING_BATCH_WINDOW_SECONDS of each other
+        share one model call, so throughput grows with concurrency instead of
+        each request paying for its own forward pass.
+        """
+        texts = list(texts)
+        if self._embedding_requests is None:
+            return await self.run_blocking(self.encode_batch, texts)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._embedding_requests.put((texts, loop, future))
+        return await future
+    
+    def _embedding_loop(self, requests: queue.Queue):
+        """Worker thread: drain queued requests into batches and encode them"""
+        stopping = False
+        while not stopping:
+            request = requests.get()
+            if request is None:
+                return
+            batch = [request]
+            pending_texts = len(request[0])
+            deadline = time.monotonic() + EMBEDDING_BATCH_WINDOW_SECONDS
+            while pending_texts < EMBEDDING_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                pending_texts += len(request[0])
+            
+            try:
+                embeddings = self.encode_batch([text for texts, _, _ in batch for text in texts])
+                error = None
+            except Exception as e:
+                embeddings, error = [], e
+            
+            offset = 0
+            for texts, loop, future in batch:
+                result = embeddings[offset:offset + len(texts)]
+                offset += len(texts)
+                loop.call_soon_threadsafe(_resolve_future, future, result, error)
+    
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text query"""
+        return self.encode_batch([text])[0]
+    
+    def encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in one model call
+        
+        Texts embedded recently are served from an exact-match LRU; only the
+        rest go through the model.
+        """
         if not self.model:
             raise RuntimeError("Model not initialized")
         
-        try:
-            embedding = self.model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
-        except Exception as e:
-            raise RuntimeError(f"Error generating embedding: {e}")
+        texts = list(texts)
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._embedding_cache_lock:
+            for index, text in enumerate(texts):
+                cached = self._embedding_cache.get(text)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(text)
+                    embeddings[index] = cached
+                else:
+                    missing.setdefault(text, []).append(index)
+        
+        if missing:
+            try:
+                # inference_mode also skips the version-counter bookkeeping
+                # that encode's own no_grad keeps
+                with torch.inference_mode():
+                    encoded = self.model.encode(
+                        list(missing),
+                        batch_size=EMBEDDING_BATCH_SIZE,
+                        convert_to_numpy=True,
+                        show_progress_bar=False
+                    ).astype("float32", copy=False).tolist()
+            except Exception as e:
+                raise RuntimeError(f"Error generating embeddings: {e}")
+            
+            with self._embedding_cache_lock:
+                for (text, indexes), embedding in zip(missing.items(), encoded):
+                    for index in indexes:
+                        embeddings[index] = embedding
+                    self._embedding_cache[text] = embedding
+                while len(self._embedding_cache) > EMBEDDING_CACHE_MAX_ENTRIES:
+                    self._embedding_cache.popitem(last=False)
+        
+        return embeddings
     
     async def search_collection(
         self,
@@ -101,19 +379,77 @@ class VectorSearchService:
             raise ValueError(f"Unknown collection: {collection_name}")
         
         try:
-            # Generate query embedding
-            query_embedding = self._generate_embedding(query)
-            
-            # Perform search
-            search_results = self.client.search(
-                collection_name=collection_name,
-                query_vector=query_embedding,
-                limit=limit,
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            # Convert to recommendations
+            # The embedding model is blocking, so it runs on the embedding worker
+            query_embedding = (await self.embed([query]))[0]
+        except Exception as e:
+            logger.error(f"Error searching collection {collection_name}: {e}")
+            return []
+        
+        return await self.search_collection_with_vector(collection_name, query_embedding, limit=limit)
+    
+    async def search_collection_with_vector(
+        self,
+        collection_name: str,
+        query_vector: List[float],
+        limit: int = 5
+    ) -> List[RecipeRecommendation]:
+        """Search within a specific collection using a precomputed query embedding"""
+        results = await self.search_collection_with_vectors(collection_name, [query_vector], limit=limit)
+        return results[0]
+    
+    async def search_collection_with_vectors(
+        self,
+        collection_name: str,
+        query_vectors: List[List[float]],
+        limit: int = 5
+    ) -> List[List[RecipeRecommendation]]:
+        """Search one collection with several precomputed query embeddings
+        
+        Vectors close to a recently searched one are answered from the search
+        cache; the rest go to Qdrant in a single search_batch request, so N
+        queries against a collection cost at most one round-trip. Returns one
+        result list per vector, in order; a failed request yields empty lists.
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        if collection_name not in AVAILABLE_COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection_name}")
+        
+        cache_key = hash((collection_name, limit))
+        all_recommendations: List[Optional[List[RecipeRecommendation]]] = []
+        misses = []
+        for index, query_vector in enumerate(query_vectors):
+            cached = self._search_cache.lookup(query_vector, cache_key)
+            all_recommendations.append(list(cached) if cached is not None else None)
+            if cached is None:
+                misses.append(index)
+        if not misses:
+            return all_recommendations
+        
+        try:
+            # The Qdrant client is blocking, so searches run in worker threads
+            # and concurrent searches do not stall the event loop
+            async with self._search_slots:
+                batch_results = await self.run_blocking(
+                    self.client.search_batch,
+                    collection_name=collection_name,
+                    requests=[
+                        rest.SearchRequest(
+                            vector=query_vectors[index],
+                            limit=limit,
+                            with_payload=RECOMMENDATION_PAYLOAD_FIELDS,
+                            with_vector=False
+                        )
+                        for index in misses
+                    ]
+                )
+        except Exception as e:
+            logger.error(f"Error searching collection {collection_name}: {e}")
+            return [recommendations or [] for recommendations in all_recommendations]
+        
+        # Convert to recommendations
+        for index, search_results in zip(misses, batch_results):
             recommendations = []
             for result in search_results:
                 try:
@@ -121,54 +457,90 @@ class VectorSearchService:
                     if recommendation:
                         recommendations.append(recommendation)
                 except Exception as e:
-                    print(f"Error processing search result: {e}")
+                    logger.error(f"Error processing search result: {e}")
                     continue
-            
-            return recommendations
-            
-        except Exception as e:
-            print(f"Error searching collection {collection_name}: {e}")
-            return []
+            self._search_cache.store(query_vectors[index], cache_key, recommendations)
+            all_recommendations[index] = list(recommendations)
+        
+        return all_recommendations
     
     async def search_multiple_collections(
         self,
         queries_by_collection: Dict[str, List[str]],
-        results_per_query: int = 3
+        results_per_query: int = 3,
+        embeddings: Optional[Dict[str, List[float]]] = None
     ) -> List[RecipeRecommendation]:
-        """Search multiple collections with different queries"""
+        """Search multiple collections with different queries, concurrently
+        
+        Duplicate (collection, query) pairs are searched once, each distinct
+        query string is embedded once in a single batched model call, and each
+        collection's queries go to Qdrant in one search_batch request.
+        Pass the same `embeddings` dict across calls to share embeddings
+        between them (e.g. for the collections of one request).
+        """
         if not self._initialized:
             await self.initialize()
         
-        all_recommendations = []
-        
+        # Distinct queries per known collection, in order
+        pending: Dict[str, List[str]] = {}
         for collection_name, queries in queries_by_collection.items():
             if collection_name not in AVAILABLE_COLLECTIONS:
-                print(f"Warning: Unknown collection {collection_name}, skipping")
+                logger.warning(f"Warning: Unknown collection {collection_name}, skipping")
                 continue
-            
-            for query in queries:
-                try:
-                    recommendations = await self.search_collection(
-                        collection_name=collection_name,
-                        query=query,
-                        limit=results_per_query
-                    )
-                    all_recommendations.extend(recommendations)
-                    
-                except Exception as e:
-                    print(f"Error searching {collection_name} with query '{query}': {e}")
-                    continue
+            if queries:
+                pending[collection_name] = list(dict.fromkeys(queries))
+        
+        if embeddings is None:
+            embeddings = {}
+        missing = list(dict.fromkeys(
+            query for queries in pending.values() for query in queries if query not in embeddings
+        ))
+        if missing:
+            try:
+                embeddings.update(zip(missing, await self.embed(missing)))
+            except Exception as e:
+                logger.error(f"Error generating query embeddings: {e}")
+                return []
         
-        # Sort by similarity score and remove duplicates
-        seen_ids = set()
-        unique_recommendations = []
+        # One batched Qdrant request per collection, all collections concurrently
+        results = await asyncio.gather(
+            *(
+                self.search_collection_with_vectors(
+                    collection_name,
+                    [embeddings[query] for query in queries],
+                    limit=results_per_query
+                )
+                for collection_name, queries in pending.items()
+            ),
+            return_exceptions=True
+        )
+        for collection_name, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error searching {collection_name}: {result}")
+        
+        return self.merge_recommendations(
+            rec
+            for result in results if not isinstance(result, BaseException)
+            for recommendations in result
+            for rec in recommendations
+        )
+    
+    def merge_recommendations(
+        self,
+        recommendations: Iterable[RecipeRecommendation]
+    ) -> List[RecipeRecommendation]:
+        """Keep the best-scoring hit per recipe, sorted by similarity score
         
-        for rec in sorted(all_recommendations, key=lambda x: x.similarity_score, reverse=True):
-            if rec.recipe_id not in seen_ids:
-                seen_ids.add(rec.recipe_id)
-                unique_recommendations.append(rec)
+        Duplicates are dropped in one pass before sorting, so only unique
+        recipes are sorted.
+        """
+        best: Dict[str, RecipeRecommendation] = {}
+        for rec in recommendations:
+            current = best.get(rec.recipe_id)
+            if current is None or rec.similarity_score > current.similarity_score:
+                best[rec.recipe_id] = rec
         
-        return unique_recommendations
+        return sorted(best.values(), key=lambda x: x.similarity_score, reverse=True)
     
     async def search_all_collections(
         self,
@@ -188,6 +560,33 @@ class VectorSearchService:
         
         return recommendations[:total_limit]
     
+    def enrich_recommendations(
+        self,
+        recommendations: Iterable[RecipeRecommendation]
+    ) -> List[RecipeRecommendation]:
+        """Attach full ingredients and instructions from the classified recipes
+        
+        Search hits carry only payload fields; this lookup is done for the
+        final recommendations only. Returns copies, so cached search results
+        are never modified.
+        """
+        enriched = []
+        for rec in recommendations:
+            recipe_data = self.get_classified_recipe(rec.recipe_id)
+            if recipe_data is None:
+                enriched.append(rec)
+                continue
+            enriched.append(rec.model_copy(update={
+                "metadata": {
+                    "original_data": {
+                        "ingredients": recipe_data.get("ingredients", []),
+                        "instructions": recipe_data.get("instructions", ""),
+                        "title": recipe_data.get("title", rec.title)
+                    }
+                }
+            }))
+        return enriched
+    
     def _create_recommendation(
         self,
         search_result: Any,
@@ -195,23 +594,23 @@ class VectorSearchService:
     ) -> Optional[RecipeRecommendation]:
         """Convert Qdrant search result to RecipeRecommendation"""
         try:
-            payload = search_result.payload
+            get = search_result.payload.get  # bound once; called per field on every hit
             score = float(search_result.score)
             
             # Extract basic information
-            recipe_id = str(payload.get("recipe_id", ""))
-            title = payload.get("title", "Unknown Recipe")
-            summary = payload.get("summary", "")
-            confidence = payload.get("confidence", 0)
+            recipe_id = str(get("recipe_id", ""))
+            title = get("title", "Unknown Recipe")
+            summary = get("summary", "")
+            confidence = get("confidence", 0)
             
             # Parse ingredients preview
-            ingredients_str = payload.get("ingredients_preview", "")
+            ingredients_str = get("ingredients_preview", "")
             if ingredients_str:
                 try:
                     # Handle both string and list formats
                     if isinstance(ingredients_str, str):
                         if ingredients_str.startswith('[') and ingredients_str.endswith(']'):
-                            ingredients_preview = eval(ingredients_str)  # Safe for simple lists
+                            ingredients_preview = self._parse_list_literal(ingredients_str)
                         else:
                             ingredients_preview = [ing.strip() for ing in ingredients_str.split(',')]
                     else:
@@ -222,20 +621,10 @@ class VectorSearchService:
                 ingredients_preview = []
             
             # Get instructions preview
-            instructions_preview = payload.get("instructions_preview", "")
-            
-            # Get additional metadata from classified recipes if available
-            additional_metadata = {}
-            if self.classified_recipes and recipe_id in self.classified_recipes:
-                recipe_data = self.classified_recipes[recipe_id]
-                additional_metadata = {
-                    "original_data": {
-                        "ingredients": recipe_data.get("ingredients", []),
-                        "instructions": recipe_data.get("instructions", ""),
-                        "title": recipe_data.get("title", title)
-                    }
-                }
+            instructions_preview = get("instructions_preview", "")
             
+            # Full recipe metadata is attached later, only where it is returned
+            # (see enrich_recommendations)
             return RecipeRecommendation(
                 recipe_id=recipe_id,
                 title=title,
@@ -244,16 +633,39 @@ class VectorSearchService:
                 summary=summary,
                 ingredients_preview=ingredients_preview[:5],  # Limit to first 5 ingredients
                 instructions_preview=instructions_preview[:200],  # Limit preview length
-                confidence=confidence,
-                metadata=additional_metadata
+                confidence=confidence
             )
             
         except Exception as e:
-            print(f"Error creating recommendation from search result: {e}")
+            logger.error(f"Error creating recommendation from search result: {e}")
             return None
     
-    async def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
-        """Get information about a specific collection"""
+    @staticmethod
+    def _parse_list_literal(text: str) -> List[str]:
+        """Parse a list stored as a string, without eval
+        
+        JSON lists take the fast C parser; Python-repr lists (single quotes)
+        fall back to ast.literal_eval, and anything else to a plain split.
+        """
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return [item.strip().strip("'\"") for item in text[1:-1].split(',')]
+    
+    async def get_collection_info(
+        self,
+        collection_name: str,
+        existing_collections: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """Get information about a specific collection
+        
+        `existing_collections` lets callers describing several collections
+        list them from Qdrant once instead of once per collection.
+        """
         if not self._initialized:
             await self.initialize()
         
@@ -262,8 +674,8 @@ class VectorSearchService:
         
         try:
             # Get collection info from Qdrant
-            collections_list = self.client.get_collections()
-            existing_collections = [col.name for col in collections_list.collections]
+            if existing_collections is None:
+                existing_collections = await self._list_collection_names()
             
             if collection_name not in existing_collections:
                 return {
@@ -273,29 +685,19 @@ class VectorSearchService:
                     "status": "missing"
                 }
             
-            # Try to get approximate count using search
-            try:
-                dummy_vector = [0.0] * 768
-                search_result = self.client.search(
-                    collection_name=collection_name,
-                    query_vector=dummy_vector,
-                    limit=1,
-                    with_payload=False,
-                    with_vectors=False
-                )
-                status = "ready" if search_result else "empty"
-            except:
-                status = "ready"  # Assume ready if search works
+            # Collection metadata carries the exact point count; no search needed
+            info = await self.run_blocking(self.client.get_collection, collection_name)
+            recipe_count = info.points_count or 0
             
             return {
                 "name": collection_name,
                 "description": AVAILABLE_COLLECTIONS[collection_name].description,
-                "recipe_count": AVAILABLE_COLLECTIONS[collection_name].estimated_count,
-                "status": status
+                "recipe_count": recipe_count,
+                "status": "ready" if recipe_count else "empty"
             }
             
         except Exception as e:
-            print(f"Error getting collection info for {collection_name}: {e}")
+            logger.error(f"Error getting collection info for {collection_name}: {e}")
             return {
                 "name": collection_name,
                 "description": AVAILABLE_COLLECTIONS[collection_name].description,
@@ -303,30 +705,45 @@ class VectorSearchService:
                 "status": f"error: {e}"
             }
     
+    async def _list_collection_names(self) -> Set[str]:
+        """Names of the collections that exist in Qdrant"""
+        collections_list = await self.run_blocking(self.client.get_collections)
+        return {col.name for col in collections_list.collections}
+    
     async def get_all_collections_info(self) -> List[Dict[str, Any]]:
-        """Get information about all collections"""
-        collections_info = []
+        """Get information about all collections, concurrently"""
+        if not self._initialized:
+            await self.initialize()
         
-        for collection_name in AVAILABLE_COLLECTIONS.keys():
-            try:
-                info = await self.get_collection_info(collection_name)
-                collections_info.append(info)
-            except Exception as e:
-                print(f"Error getting info for collection {collection_name}: {e}")
+        try:
+            existing_collections = await self._list_collection_names()
+        except Exception as e:
+            logger.error(f"Error listing collections: {e}")
+            existing_collections = None  # Each lookup retries and reports its own error
+        
+        results = await asyncio.gather(
+            *(
+                self.get_collection_info(collection_name, existing_collections)
+                for collection_name in AVAILABLE_COLLECTIONS.keys()
+            ),
+            return_exceptions=True
+        )
+        
+        collections_info = []
+        for collection_name, info in zip(AVAILABLE_COLLECTIONS.keys(), results):
+            if isinstance(info, BaseException):
+                logger.error(f"Error getting info for collection {collection_name}: {info}")
                 continue
+            collections_info.append(info)
         
         return collections_info
     
     async def get_recipe_details(self, recipe_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific recipe"""
-        if not self.classified_recipes:
-            return None
-        
-        if recipe_id not in self.classified_recipes:
+        recipe_data = self.get_classified_recipe(recipe_id)
+        if recipe_data is None:
             return None
         
-        recipe_data = self.classified_recipes[recipe_id]
-        
         return {
             "recipe_id": recipe_id,
             "title": recipe_data.get("title", ""),
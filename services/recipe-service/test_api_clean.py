@@ -7,13 +7,17 @@ Tests all main endpoints with the populated vector database
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 API_BASE = "http://localhost:8001"
 
+# One keep-alive session for all tests instead of a new connection per request
+SESSION = requests.Session()
+
 def test_health():
     """Test health endpoint"""
     print("🏥 Testing Health Endpoint...")
-    response = requests.get(f"{API_BASE}/health")
+    response = SESSION.get(f"{API_BASE}/health")
     
     if response.status_code == 200:
         data = response.json()
@@ -27,7 +31,7 @@ def test_health():
 def test_collections():
     """Test collections endpoint"""
     print("\n📁 Testing Collections Endpoint...")
-    response = requests.get(f"{API_BASE}/collections")
+    response = SESSION.get(f"{API_BASE}/collections")
     
     if response.status_code == 200:
         data = response.json()
@@ -51,13 +55,21 @@ def test_search():
         {"query": "pasta", "max_results": 2, "collections": ["comfort-cooked"]}
     ]
     
-    for i, query_data in enumerate(test_queries, 1):
+    def post_search(query_data):
+        # requests.Session is not thread-safe, so each worker opens its own
+        with requests.Session() as session:
+            return session.post(
+                f"{API_BASE}/search",
+                json=query_data,
+                headers={"Content-Type": "application/json"}
+            )
+    
+    # Send all queries at once; results are reported in query order
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as pool:
+        responses = list(pool.map(post_search, test_queries))
+    
+    for i, (query_data, response) in enumerate(zip(test_queries, responses), 1):
         print(f"\n   Test {i}: {query_data['query']}")
-        response = requests.post(
-            f"{API_BASE}/search",
-            json=query_data,
-            headers={"Content-Type": "application/json"}
-        )
         
         if response.status_code == 200:
             data = response.json()
@@ -83,7 +95,7 @@ def test_collection_search():
     """Test collection-specific search"""
     print("\n🎯 Testing Collection-Specific Search...")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_BASE}/collections/desserts-sweets/search",
         json={"query": "chocolate dessert", "max_results": 2},
         headers={"Content-Type": "application/json"}
@@ -112,7 +124,7 @@ def test_recommendations():
         {"role": "user", "content": "Something with chocolate would be perfect"}
     ]
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_BASE}/recommendations",
         json={
             "conversation_history": conversation,
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Add the parent directory to sys.path to import the service modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
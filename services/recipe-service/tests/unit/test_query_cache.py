@@ -0,0 +1,188 @@
+import pytest
+from unittest.mock import patch
+from services.query_cache import SemanticQueryCache, ExactQueryCache
+
+
+@pytest.fixture
+def clock():
+    """Replace time.monotonic with a clock advanced by hand."""
+    now = [1000.0]
+    with patch("services.query_cache.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+class TestSemanticQueryCache:
+    """Test suite for the SemanticQueryCache class."""
+
+    def test_lookup_empty_cache(self):
+        """Test looking up an embedding before anything is stored."""
+        # Arrange
+        cache = SemanticQueryCache()
+
+        # Act
+        result = cache.lookup([1.0, 0.0], context_key=1)
+
+        # Assert
+        assert result is None
+
+    def test_lookup_similar_embedding(self):
+        """Test looking up an embedding above the similarity threshold."""
+        # Arrange
+        cache = SemanticQueryCache(threshold=0.95)
+        cache.store([1.0, 0.0, 0.0], context_key=1, queries={"quick-light": ["salad"]})
+
+        # Act
+        result = cache.lookup([0.99, 0.05, 0.0], context_key=1)
+
+        # Assert
+        assert result == {"quick-light": ["salad"]}
+
+    def test_lookup_dissimilar_embedding(self):
+        """Test looking up an embedding below the similarity threshold."""
+        # Arrange
+        cache = SemanticQueryCache(threshold=0.95)
+        cache.store([1.0, 0.0], context_key=1, queries="stored")
+
+        # Act
+        result = cache.lookup([0.7, 0.7], context_key=1)
+
+        # Assert
+        assert result is None
+
+    def test_lookup_normalizes_embeddings(self):
+        """Test looking up embeddings that differ only in scale."""
+        # Arrange
+        cache = SemanticQueryCache(threshold=0.95)
+        cache.store([2.0, 0.0], context_key=1, queries="stored")
+
+        # Act
+        result = cache.lookup([10.0, 0.0], context_key=1)
+
+        # Assert
+        assert result == "stored"
+
+    def test_lookup_different_context(self):
+        """Test looking up a matching embedding from another conversation context."""
+        # Arrange
+        cache = SemanticQueryCache()
+        cache.store([1.0, 0.0], context_key=1, queries="first context")
+
+        # Act
+        result = cache.lookup([1.0, 0.0], context_key=2)
+
+        # Assert
+        assert result is None
+
+    def test_lookup_returns_best_match(self):
+        """Test looking up an embedding that matches several entries."""
+        # Arrange
+        cache = SemanticQueryCache(threshold=0.9)
+        cache.store([1.0, 0.2], context_key=1, queries="close")
+        cache.store([1.0, 0.0], context_key=1, queries="closest")
+
+        # Act
+        result = cache.lookup([1.0, 0.01], context_key=1)
+
+        # Assert
+        assert result == "closest"
+
+    def test_lookup_expired_entry(self, clock):
+        """Test looking up an entry before and after its TTL runs out."""
+        # Arrange
+        cache = SemanticQueryCache(ttl_seconds=60.0)
+        cache.store([1.0, 0.0], context_key=1, queries="stored")
+
+        # Act
+        clock[0] += 30.0
+        fresh = cache.lookup([1.0, 0.0], context_key=1)
+        clock[0] += 31.0
+        expired = cache.lookup([1.0, 0.0], context_key=1)
+
+        # Assert
+        assert fresh == "stored"
+        assert expired is None
+
+    def test_store_overwrites_oldest_entry(self):
+        """Test storing into a full cache replaces the oldest entry."""
+        # Arrange
+        cache = SemanticQueryCache(max_entries=2)
+        cache.store([1.0, 0.0, 0.0], context_key=1, queries="first")
+        cache.store([0.0, 1.0, 0.0], context_key=1, queries="second")
+
+        # Act
+        cache.store([0.0, 0.0, 1.0], context_key=1, queries="third")
+
+        # Assert
+        assert cache.lookup([1.0, 0.0, 0.0], context_key=1) is None
+        assert cache.lookup([0.0, 1.0, 0.0], context_key=1) == "second"
+        assert cache.lookup([0.0, 0.0, 1.0], context_key=1) == "third"
+
+
+class TestExactQueryCache:
+    """Test suite for the ExactQueryCache class."""
+
+    def test_make_key(self):
+        """Test building keys from a request and a context summary."""
+        # Act
+        key = ExactQueryCache.make_key("pasta", "vegetarian")
+
+        # Assert
+        assert key == ExactQueryCache.make_key("pasta", "vegetarian")
+        assert len(key) == 16
+        assert key != ExactQueryCache.make_key("pastav", "egetarian")
+
+    def test_get_stored_entry(self):
+        """Test getting an entry after putting it."""
+        # Arrange
+        cache = ExactQueryCache()
+        key = cache.make_key("pasta", "")
+        cache.put(key, {"comfort-cooked": ["baked pasta"]})
+
+        # Act
+        result = cache.get(key)
+
+        # Assert
+        assert result == {"comfort-cooked": ["baked pasta"]}
+
+    def test_get_missing_entry(self):
+        """Test getting a key that was never stored."""
+        # Arrange
+        cache = ExactQueryCache()
+
+        # Act
+        result = cache.get(cache.make_key("pasta", ""))
+
+        # Assert
+        assert result is None
+
+    def test_get_expired_entry(self, clock):
+        """Test getting an entry after its TTL runs out."""
+        # Arrange
+        cache = ExactQueryCache(ttl_seconds=60.0)
+        key = cache.make_key("pasta", "")
+        cache.put(key, {"queries": []})
+
+        # Act
+        clock[0] += 61.0
+        result = cache.get(key)
+
+        # Assert
+        assert result is None
+        assert key not in cache._entries
+
+    def test_put_evicts_least_recently_used(self):
+        """Test putting into a full cache evicts the least recently read entry."""
+        # Arrange
+        cache = ExactQueryCache(max_entries=2)
+        first, second, third = (cache.make_key(text, "") for text in ("a", "b", "c"))
+        cache.put(first, {"entry": 1})
+        cache.put(second, {"entry": 2})
+        cache.get(first)
+
+        # Act
+        cache.put(third, {"entry": 3})
+
+        # Assert
+        assert cache.get(first) == {"entry": 1}
+        assert cache.get(second) is None
+        assert cache.get(third) == {"entry": 3}
@@ -0,0 +1,372 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# models.py is built on pydantic
+pytest.importorskip("pydantic")
+
+from models import ConversationMessage
+from services.query_generation_service import (
+    COLLECTION_NAMES,
+    GEMINI_COOLDOWN_BASE_SECONDS,
+    GEMINI_COOLDOWN_MAX_SECONDS,
+    ConversationWindow,
+    QueryGenerationService,
+    StreamingObjectParser,
+    _build_keyword_scanner,
+    recent_messages,
+)
+
+
+def get_test_history(*contents):
+    """
+    Return a conversation alternating user and assistant messages.
+    """
+    roles = ("user", "assistant")
+    return [
+        ConversationMessage(role=roles[index % 2], content=content)
+        for index, content in enumerate(contents)
+    ]
+
+
+class TestStreamingObjectParser:
+    """Test suite for the StreamingObjectParser class."""
+
+    @pytest.fixture
+    def parser(self):
+        """Create an empty StreamingObjectParser."""
+        return StreamingObjectParser()
+
+    def test_feed_returns_entries_as_they_complete(self, parser):
+        """Test feeding a response split across several chunks."""
+        # Act
+        first = parser.feed('{"quick-light": ["salad", "wr')
+        second = parser.feed('aps"], "fresh-cold"')
+        third = parser.feed(': ["gazpacho"]}')
+
+        # Assert
+        assert first == []
+        assert second == [("quick-light", ["salad", "wraps"])]
+        assert third == [("fresh-cold", ["gazpacho"])]
+        assert parser.done
+
+    def test_feed_skips_text_before_object(self, parser):
+        """Test feeding a response wrapped in a markdown fence."""
+        # Act
+        entries = parser.feed('```json\n{"plant-based": ["tofu bowl"]}\n```')
+
+        # Assert
+        assert entries == [("plant-based", ["tofu bowl"])]
+
+    def test_feed_structural_characters_in_strings(self, parser):
+        """Test feeding strings that contain commas, braces and escaped quotes."""
+        # Act
+        entries = parser.feed('{"a": ["x, {y}", "say \\"hi\\", ]"], "b": []}')
+
+        # Assert
+        assert entries == [("a", ["x, {y}", 'say "hi", ]']), ("b", [])]
+
+    def test_feed_one_character_at_a_time(self, parser):
+        """Test feeding a response one character per chunk."""
+        # Arrange
+        text = '{"a": [1, 2], "b": {"c": "d"}}'
+
+        # Act
+        entries = [entry for char in text for entry in parser.feed(char)]
+
+        # Assert
+        assert entries == [("a", [1, 2]), ("b", {"c": "d"})]
+
+    def test_feed_malformed_entry(self, parser):
+        """Test feeding an entry that is not valid JSON."""
+        # Act
+        entries = parser.feed('{"a": [1,], "b": [2]}')
+
+        # Assert
+        assert entries == [("b", [2])]
+
+    def test_feed_after_closing_brace(self, parser):
+        """Test feeding text after the object has been closed."""
+        # Arrange
+        parser.feed('{"a": 1}')
+
+        # Act
+        entries = parser.feed(', "b": 2}')
+
+        # Assert
+        assert entries == []
+
+    def test_feed_keeps_only_unfinished_entry(self, parser):
+        """Test the buffer holds just the entry still being read."""
+        # Act
+        parser.feed('{"first": ["' + "x" * 1000 + '"], "second": ["sal')
+
+        # Assert
+        assert parser._text == ' "second": ["sal'
+        assert parser.feed('ad"]}') == [("second", ["salad"])]
+        assert parser._text == ""
+
+
+class TestRecentMessages:
+    """Test suite for the recent_messages helper."""
+
+    def test_recent_messages(self):
+        """Test reading the last messages of a conversation."""
+        # Arrange
+        history = get_test_history("a", "b", "c", "d")
+
+        # Act
+        messages = recent_messages(history, 2)
+
+        # Assert
+        assert [msg.content for msg in messages] == ["c", "d"]
+
+    def test_recent_messages_skip_last(self):
+        """Test reading recent messages while leaving out the final ones."""
+        # Arrange
+        history = get_test_history("a", "b", "c", "d")
+
+        # Act
+        messages = recent_messages(history, 2, skip_last=1)
+
+        # Assert
+        assert [msg.content for msg in messages] == ["b", "c"]
+
+    def test_recent_messages_short_history(self):
+        """Test reading more messages than the conversation holds."""
+        # Arrange
+        history = get_test_history("a", "b")
+
+        # Act
+        messages = recent_messages(history, 10, skip_last=5)
+
+        # Assert
+        assert list(messages) == []
+        assert [msg.content for msg in recent_messages(history, 10)] == ["a", "b"]
+
+
+class TestConversationWindow:
+    """Test suite for the ConversationWindow class."""
+
+    def test_window_behaves_like_history(self):
+        """Test the length, indexing and iteration of a wrapped history."""
+        # Arrange
+        history = get_test_history("one", "two", "three")
+
+        # Act
+        window = ConversationWindow(history)
+
+        # Assert
+        assert len(window) == 3
+        assert window[1] is history[1]
+        assert window[-1] is history[-1]
+        assert list(window) == history
+
+    def test_of_reuses_existing_window(self):
+        """Test wrapping a history that is already a window."""
+        # Arrange
+        window = ConversationWindow(get_test_history("one"))
+
+        # Act
+        rewrapped = ConversationWindow.of(window)
+
+        # Assert
+        assert rewrapped is window
+        assert isinstance(ConversationWindow.of(get_test_history("one")), ConversationWindow)
+
+    def test_recent_text(self):
+        """Test joining the lowercased content of the last messages."""
+        # Arrange
+        window = ConversationWindow(get_test_history("First", "Second", "THIRD"))
+
+        # Act
+        texts = [window.recent_text(count) for count in (2, 5, 1, 0)]
+
+        # Assert
+        assert texts == ["second third", "first second third", "third", ""]
+
+    def test_prompt_blocks(self):
+        """Test building the last-10 conversation block and the last-3 tail."""
+        # Arrange
+        window = ConversationWindow(get_test_history(*(f"message {i}" for i in range(12))))
+
+        # Act
+        formatted, tail = window.prompt_blocks()
+
+        # Assert
+        formatted_lines = formatted.split("\n")
+        assert len(formatted_lines) == 10
+        assert formatted_lines[0] == "User: message 2"
+        assert formatted_lines[-1] == "Assistant: message 11"
+        assert tail.split("\n") == [
+            "- assistant: message 9...",
+            "- user: message 10...",
+            "- assistant: message 11...",
+        ]
+
+    def test_prompt_blocks_short_history(self):
+        """Test building prompt blocks for a history shorter than the tail."""
+        # Arrange
+        window = ConversationWindow(get_test_history("hello", "hi"))
+
+        # Act
+        formatted, tail = window.prompt_blocks()
+
+        # Assert
+        assert formatted == "User: hello\nAssistant: hi"
+        assert tail == "- user: hello...\n- assistant: hi..."
+
+
+class TestKeywordScanner:
+    """Test suite for the single-pass fallback keyword scanner."""
+
+    def test_build_keyword_scanner_overlapping_keywords(self):
+        """Test scanning text where one keyword sits inside a longer one."""
+        # Arrange
+        pattern, labels = _build_keyword_scanner(
+            {"gluten-free": ("gluten free",)},
+            {"healthy": ("free",)},
+        )
+
+        # Act
+        found = [match.group(1) for match in pattern.finditer("want gluten free pasta")]
+
+        # Assert
+        assert found == ["gluten free", "free"]
+        assert labels["free"] == {(1, "healthy")}
+
+    def test_build_keyword_scanner_prefix_labels(self):
+        """Test scanning a keyword that starts with a shorter keyword."""
+        # Arrange
+        pattern, labels = _build_keyword_scanner(
+            {"light": ("light",)},
+            {"quick": ("lightning",)},
+        )
+
+        # Act
+        found = [match.group(1) for match in pattern.finditer("lightning fast")]
+
+        # Assert
+        assert found == ["lightning"]
+        assert labels["lightning"] == {(0, "light"), (1, "quick")}
+        assert labels["light"] == {(0, "light")}
+
+    def test_build_keyword_scanner_escapes_keywords(self):
+        """Test scanning keywords that contain regex metacharacters."""
+        # Arrange
+        pattern, _ = _build_keyword_scanner({"plus": ("c++",)})
+
+        # Act
+        found = [match.group(1) for match in pattern.finditer("c++ and cxx")]
+
+        # Assert
+        assert found == ["c++"]
+
+    def test_fallback_analysis(self):
+        """Test the keyword-based analysis used when Gemini is unavailable."""
+        # Arrange
+        service = QueryGenerationService()
+        history = get_test_history("Something spicy and gluten free for dinner, please")
+
+        # Act
+        analysis = service._fallback_analysis(history)
+
+        # Assert
+        assert analysis["detected_preferences"] == ["spicy"]
+        assert analysis["detected_restrictions"] == ["gluten-free"]
+        assert analysis["meal_context"] == "dinner"
+
+
+class TestQueryGenerationService:
+    """Test suite for the QueryGenerationService circuit breaker."""
+
+    @pytest.fixture
+    def gemini_service(self):
+        """Create a QueryGenerationService whose Gemini calls all fail."""
+        service = QueryGenerationService()
+        service._client_attached = True
+        service._available = True
+        service.genai_client = MagicMock()
+        service.genai_client.aio.models.generate_content = AsyncMock(side_effect=ValueError("boom"))
+        service.genai_client.models.generate_content_stream.side_effect = ValueError("boom")
+        return service
+
+    @pytest.mark.asyncio
+    async def test_analyze_and_generate_queries_opens_circuit_once(self, gemini_service):
+        """Test a request whose analysis and query calls both fail."""
+        # Arrange
+        history = get_test_history("Something quick for dinner")
+
+        # Act
+        analysis, queries = await gemini_service.analyze_and_generate_queries(history)
+
+        # Assert
+        gemini_service.genai_client.aio.models.generate_content.assert_called_once()
+        gemini_service.genai_client.models.generate_content_stream.assert_called_once()
+        assert gemini_service._gemini_failures == 1
+        assert not gemini_service.is_available()
+        assert analysis["meal_context"] == "dinner"
+        assert set(queries) == set(COLLECTION_NAMES)
+
+    @pytest.mark.asyncio
+    async def test_analyze_and_generate_queries_during_cooldown(self, gemini_service):
+        """Test a request arriving while the circuit is open skips Gemini."""
+        # Arrange
+        history = get_test_history("Something quick for dinner")
+        await gemini_service.analyze_and_generate_queries(history)
+        gemini_service.genai_client.reset_mock()
+
+        # Act
+        await gemini_service.analyze_and_generate_queries(history)
+
+        # Assert
+        gemini_service.genai_client.aio.models.generate_content.assert_not_called()
+        gemini_service.genai_client.models.generate_content_stream.assert_not_called()
+        assert gemini_service._gemini_failures == 1
+
+    def test_record_gemini_failure_doubles_cooldown(self, gemini_service):
+        """Test consecutive failures doubling the cool-down up to the maximum."""
+        # Arrange
+        with patch("services.query_generation_service.time.monotonic", return_value=1000.0):
+            # Act
+            cooldowns = []
+            for _ in range(8):
+                gemini_service._record_gemini_failure()
+                cooldowns.append(gemini_service._gemini_cooldown_until - 1000.0)
+
+        # Assert
+        assert cooldowns[:3] == [
+            GEMINI_COOLDOWN_BASE_SECONDS,
+            GEMINI_COOLDOWN_BASE_SECONDS * 2,
+            GEMINI_COOLDOWN_BASE_SECONDS * 4,
+        ]
+        assert cooldowns[-1] == GEMINI_COOLDOWN_MAX_SECONDS
+
+    def test_is_available_after_cooldown(self, gemini_service):
+        """Test availability before and after the cool-down window ends."""
+        # Arrange
+        with patch("services.query_generation_service.time.monotonic") as clock:
+            clock.return_value = 1000.0
+            gemini_service._record_gemini_failure()
+
+            # Act
+            clock.return_value = 1000.0 + GEMINI_COOLDOWN_BASE_SECONDS - 1
+            during = gemini_service.is_available()
+            clock.return_value = 1000.0 + GEMINI_COOLDOWN_BASE_SECONDS
+            after = gemini_service.is_available()
+
+        # Assert
+        assert during is False
+        assert after is True
+
+    def test_record_gemini_success_closes_circuit(self, gemini_service):
+        """Test a successful call resetting the failure count."""
+        # Arrange
+        gemini_service._record_gemini_failure()
+        gemini_service._record_gemini_failure()
+
+        # Act
+        gemini_service._record_gemini_success()
+
+        # Assert
+        assert gemini_service._gemini_failures == 0
+        assert gemini_service.is_available()
@@ -0,0 +1,369 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+# The service module imports the embedding and Qdrant libraries at load time
+pytest.importorskip("pydantic")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("qdrant_client")
+
+from models import ConversationMessage, RecipeRecommendation, RecommendationRequest
+from services.recommendation_service import RecommendationService
+
+
+def get_test_recommendation(recipe_id, score, collection="quick-light"):
+    """
+    Return a test recommendation with the given ID and similarity score.
+    """
+    return RecipeRecommendation(
+        recipe_id=recipe_id,
+        title=f"Recipe {recipe_id}",
+        collection=collection,
+        similarity_score=score,
+        summary="",
+    )
+
+
+def get_test_recommendations():
+    """
+    Return test recommendations as returned by a collection search.
+    """
+    return [get_test_recommendation("1", 0.9), get_test_recommendation("2", 0.8)]
+
+
+def get_test_collections_data(status="ready"):
+    """
+    Return collection info as returned by the vector search service.
+    """
+    return [
+        {"name": name, "description": f"{name} recipes", "recipe_count": 10, "status": status}
+        for name in ("quick-light", "fresh-cold")
+    ]
+
+
+def get_test_request(content="Something quick for dinner", **kwargs):
+    """
+    Return a recommendation request for a one-message conversation.
+    """
+    return RecommendationRequest(
+        conversation_history=[ConversationMessage(role="user", content=content)],
+        **kwargs
+    )
+
+
+class TestRecommendationService:
+    """Test suite for the RecommendationService class."""
+
+    @pytest.fixture
+    def recommendation_service(self):
+        """Create a RecommendationService with mocked vector search and query generation."""
+        with patch("services.recommendation_service.VectorSearchService"), \
+             patch("services.recommendation_service.QueryGenerationService"):
+            service = RecommendationService()
+        service._initialized = True
+
+        vector_service = service.vector_service
+        vector_service.search_multiple_collections = AsyncMock(return_value=get_test_recommendations())
+        vector_service.merge_recommendations.side_effect = lambda recs: list(recs)
+        vector_service.enrich_recommendations.side_effect = lambda recs: recs
+
+        query_service = service.query_service
+        query_service.analyze_and_generate_queries = AsyncMock(return_value=(
+            {"detected_preferences": [], "detected_restrictions": [], "meal_context": "dinner"},
+            {"quick-light": ["quick dinner"]},
+        ))
+        query_service.is_available.return_value = True
+
+        yield service
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_from_response_cache(self, recommendation_service):
+        """Test repeating a request serves the cached response."""
+        # Arrange
+        first = await recommendation_service.get_recommendations(get_test_request())
+
+        # Act
+        second = await recommendation_service.get_recommendations(get_test_request())
+
+        # Assert
+        recommendation_service.query_service.analyze_and_generate_queries.assert_called_once()
+        recommendation_service.vector_service.search_multiple_collections.assert_called_once()
+        assert first.status == "success"
+        assert second.recommendations == first.recommendations
+        assert second.query_analysis.generated_queries == {"quick-light": ["quick dinner"]}
+        assert second.query_analysis.processing_time_ms is not None
+        assert first.query_analysis.processing_time_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_cache_keeps_preferences_apart(self, recommendation_service):
+        """Test requests differing only in preferences are not served from each other's cache."""
+        # Arrange
+        await recommendation_service.get_recommendations(
+            get_test_request(user_preferences={"dietary_restrictions": ["vegan"]})
+        )
+
+        # Act
+        await recommendation_service.get_recommendations(
+            get_test_request(user_preferences={"dietary_restrictions": []})
+        )
+
+        # Assert
+        assert recommendation_service.query_service.analyze_and_generate_queries.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_fallback_not_cached(self, recommendation_service):
+        """Test responses built while Gemini is unavailable are not cached."""
+        # Arrange
+        recommendation_service.query_service.is_available.return_value = False
+        await recommendation_service.get_recommendations(get_test_request())
+
+        # Act
+        await recommendation_service.get_recommendations(get_test_request())
+
+        # Assert
+        assert recommendation_service.query_service.analyze_and_generate_queries.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_collections_info_cached(self, recommendation_service):
+        """Test listing collections twice within the cache TTL."""
+        # Arrange
+        vector_service = recommendation_service.vector_service
+        vector_service.get_all_collections_info = AsyncMock(return_value=get_test_collections_data())
+        vector_service.get_collection_info = AsyncMock()
+        first = await recommendation_service.get_collections_info()
+
+        # Act
+        second = await recommendation_service.get_collections_info()
+        single = await recommendation_service.get_collection_info("fresh-cold")
+
+        # Assert
+        vector_service.get_all_collections_info.assert_called_once()
+        vector_service.get_collection_info.assert_not_called()
+        assert [info.name for info in second] == ["quick-light", "fresh-cold"]
+        assert second == first
+        assert single.name == "fresh-cold"
+
+    @pytest.mark.asyncio
+    async def test_get_collections_info_expired(self, recommendation_service):
+        """Test listing collections again after the cache TTL."""
+        # Arrange
+        vector_service = recommendation_service.vector_service
+        vector_service.get_all_collections_info = AsyncMock(return_value=get_test_collections_data())
+
+        # Act
+        with patch("services.recommendation_service.COLLECTIONS_INFO_TTL_SECONDS", 0.0):
+            await recommendation_service.get_collections_info()
+            await recommendation_service.get_collections_info()
+
+        # Assert
+        assert vector_service.get_all_collections_info.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_collections_info_errors_not_cached(self, recommendation_service):
+        """Test listing collections while Qdrant reports errors."""
+        # Arrange
+        vector_service = recommendation_service.vector_service
+        vector_service.get_all_collections_info = AsyncMock(side_effect=[
+            get_test_collections_data(status="error: connection refused"),
+            get_test_collections_data(),
+        ])
+        await recommendation_service.get_collections_info()
+
+        # Act
+        infos = await recommendation_service.get_collections_info()
+
+        # Assert
+        assert vector_service.get_all_collections_info.call_count == 2
+        assert all(info.status == "ready" for info in infos)
+
+    @pytest.mark.asyncio
+    async def test_direct_search_stream_yields_fastest_collection_first(self, recommendation_service):
+        """Test streaming results before the slowest collection has answered."""
+        # Arrange
+        slow_collection_release = asyncio.Event()
+
+        async def search(collection, query_vector, limit):
+            if collection == "fresh-cold":
+                await slow_collection_release.wait()
+                return [get_test_recommendation("2", 0.95, collection)]
+            return [get_test_recommendation("1", 0.8, collection)]
+
+        vector_service = recommendation_service.vector_service
+        vector_service.embed = AsyncMock(return_value=[[0.1, 0.2]])
+        vector_service.search_collection_with_vector = search
+        stream = recommendation_service.direct_search_stream(
+            "soup", collections=["quick-light", "fresh-cold"], max_results=4
+        )
+
+        # Act
+        first = await stream.__anext__()
+        slow_collection_release.set()
+        rest = [rec async for rec in stream]
+
+        # Assert
+        assert first.recipe_id == "1"
+        assert [rec.recipe_id for rec in rest] == ["2"]
+        vector_service.embed.assert_called_once_with(["soup"])
+
+    @pytest.mark.asyncio
+    async def test_direct_search_stream_keeps_running_top_results(self, recommendation_service):
+        """Test streaming skips duplicates and results outside the running top."""
+        # Arrange
+        batches = {
+            "quick-light": [get_test_recommendation("1", 0.9), get_test_recommendation("2", 0.7)],
+            "fresh-cold": [
+                get_test_recommendation("1", 0.95, "fresh-cold"),
+                get_test_recommendation("3", 0.8, "fresh-cold"),
+                get_test_recommendation("4", 0.6, "fresh-cold"),
+            ],
+        }
+
+        async def search(collection, query_vector, limit):
+            if collection == "fresh-cold":
+                await asyncio.sleep(0.01)
+            return batches[collection]
+
+        vector_service = recommendation_service.vector_service
+        vector_service.embed = AsyncMock(return_value=[[0.1, 0.2]])
+        vector_service.search_collection_with_vector = search
+
+        # Act
+        results = [
+            rec async for rec in recommendation_service.direct_search_stream(
+                "soup", collections=["quick-light", "fresh-cold"], max_results=2
+            )
+        ]
+
+        # Assert
+        assert [rec.recipe_id for rec in results] == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_direct_search_stream_cancels_pending_searches(self, recommendation_service):
+        """Test closing the stream early cancels the searches still running."""
+        # Arrange
+        cancelled = []
+
+        async def search(collection, query_vector, limit):
+            if collection == "fresh-cold":
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(collection)
+                    raise
+            return [get_test_recommendation("1", 0.8, collection)]
+
+        vector_service = recommendation_service.vector_service
+        vector_service.embed = AsyncMock(return_value=[[0.1, 0.2]])
+        vector_service.search_collection_with_vector = search
+        stream = recommendation_service.direct_search_stream(
+            "soup", collections=["quick-light", "fresh-cold"], max_results=4
+        )
+        await stream.__anext__()
+
+        # Act
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        # Assert
+        assert cancelled == ["fresh-cold"]
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_joins_inflight_request(self, recommendation_service):
+        """Test concurrent identical requests sharing one pipeline run."""
+        # Arrange
+        query_service = recommendation_service.query_service
+        release = asyncio.Event()
+        analysis_result = query_service.analyze_and_generate_queries.return_value
+
+        async def analyze(conversation_history, on_collection=None):
+            await release.wait()
+            return analysis_result
+
+        query_service.analyze_and_generate_queries = AsyncMock(side_effect=analyze)
+
+        # Act
+        pending = [
+            asyncio.ensure_future(recommendation_service.get_recommendations(get_test_request()))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*pending)
+
+        # Assert
+        query_service.analyze_and_generate_queries.assert_called_once()
+        assert all(response.status == "success" for response in responses)
+        assert recommendation_service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_cancelled_caller(self, recommendation_service):
+        """Test a cancelled caller leaving the shared pipeline running for the others."""
+        # Arrange
+        query_service = recommendation_service.query_service
+        release = asyncio.Event()
+        analysis_result = query_service.analyze_and_generate_queries.return_value
+
+        async def analyze(conversation_history, on_collection=None):
+            await release.wait()
+            return analysis_result
+
+        query_service.analyze_and_generate_queries = AsyncMock(side_effect=analyze)
+        first = asyncio.ensure_future(recommendation_service.get_recommendations(get_test_request()))
+        second = asyncio.ensure_future(recommendation_service.get_recommendations(get_test_request()))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+        release.set()
+        response = await second
+
+        # Assert
+        assert first.cancelled()
+        assert response.status == "success"
+        query_service.analyze_and_generate_queries.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_different_requests_run_separately(self, recommendation_service):
+        """Test concurrent requests with different conversations each running the pipeline."""
+        # Act
+        await asyncio.gather(
+            recommendation_service.get_recommendations(get_test_request("Something quick for dinner")),
+            recommendation_service.get_recommendations(get_test_request("A light lunch")),
+        )
+
+        # Assert
+        assert recommendation_service.query_service.analyze_and_generate_queries.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_recommendations_searches_streamed_collections(self, recommendation_service):
+        """Test collections being searched as their queries stream in."""
+        # Arrange
+        searches_started = []
+        searches_before_queries_returned = []
+        vector_service = recommendation_service.vector_service
+        vector_service.search_multiple_collections.side_effect = (
+            lambda queries, **kwargs: searches_started.append(dict(queries)) or get_test_recommendations()
+        )
+
+        async def analyze(conversation_history, on_collection=None):
+            on_collection("quick-light", ["quick dinner"])
+            on_collection("fresh-cold", ["cold soup"])
+            await asyncio.sleep(0)
+            searches_before_queries_returned.append(len(searches_started))
+            return (
+                {"meal_context": "dinner"},
+                {"quick-light": ["quick dinner"], "fresh-cold": ["chilled soup"]},
+            )
+
+        recommendation_service.query_service.analyze_and_generate_queries = AsyncMock(side_effect=analyze)
+
+        # Act
+        response = await recommendation_service.get_recommendations(get_test_request())
+
+        # Assert
+        assert response.status == "success"
+        assert searches_before_queries_returned == [2]
+        assert searches_started[:2] == [{"quick-light": ["quick dinner"]}, {"fresh-cold": ["cold soup"]}]
+        # The final queries for fresh-cold changed, so only it is searched again
+        assert searches_started[2:] == [{"fresh-cold": ["chilled soup"]}]
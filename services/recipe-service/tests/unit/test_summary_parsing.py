@@ -0,0 +1,145 @@
+import os
+import pytest
+from unittest.mock import patch
+
+# The script checks the key format and imports google.genai at import time
+pytest.importorskip("google.genai")
+os.environ.setdefault("GOOGLE_API_KEY", "AIza" + "0" * 35)
+
+from generate_missing_summaries import SummaryGenerator, clean_summary_text
+
+
+class TestSummaryParsing:
+    """Test suite for parsing batched Gemini summary responses."""
+
+    @pytest.fixture
+    def generator(self):
+        """Create a SummaryGenerator with a mocked Gemini client."""
+        with patch("generate_missing_summaries.genai.Client"):
+            return SummaryGenerator()
+
+    def test_parse_batch_response_multiline_sections(self, generator):
+        """Test parsing numbered summaries that wrap onto several lines."""
+        # Arrange
+        response_text = (
+            "1. A rich chocolate cake\n"
+            "   with a ganache glaze.\n"
+            "2. A crusty sourdough loaf."
+        )
+
+        # Act
+        summaries = generator.parse_batch_response(response_text, 2)
+
+        # Assert
+        assert summaries == [
+            "A rich chocolate cake with a ganache glaze.",
+            "A crusty sourdough loaf.",
+        ]
+
+    def test_parse_batch_response_blank_line_ends_middle_section(self, generator):
+        """Test parsing a response with commentary between two numbered items."""
+        # Arrange
+        response_text = (
+            "1. A rich chocolate cake.\n"
+            "\n"
+            "Note: the next recipe needs an overnight rise.\n"
+            "2. A crusty sourdough loaf."
+        )
+
+        # Act
+        summaries = generator.parse_batch_response(response_text, 2)
+
+        # Assert
+        assert summaries == ["A rich chocolate cake.", "A crusty sourdough loaf."]
+
+    def test_parse_batch_response_blank_line_ends_final_section(self, generator):
+        """Test parsing a response with commentary after the last numbered item."""
+        # Arrange
+        response_text = (
+            "1. A rich chocolate cake.\n"
+            "2. A crusty sourdough loaf\n"
+            "   with a chewy crumb.\n"
+            "\n"
+            "Let me know if you need more."
+        )
+
+        # Act
+        summaries = generator.parse_batch_response(response_text, 2)
+
+        # Assert
+        assert summaries == [
+            "A rich chocolate cake.",
+            "A crusty sourdough loaf with a chewy crumb.",
+        ]
+
+    def test_parse_batch_response_text_on_next_line(self, generator):
+        """Test parsing items whose text starts on the line after the number."""
+        # Arrange
+        response_text = "1.\n\nA rich chocolate cake.\n2.\nA crusty sourdough loaf.\n"
+
+        # Act
+        summaries = generator.parse_batch_response(response_text, 2)
+
+        # Assert
+        assert summaries == ["A rich chocolate cake.", "A crusty sourdough loaf."]
+
+    def test_clean_summary_text_collapses_whitespace(self):
+        """Test cleaning a summary with line breaks and repeated spaces."""
+        # Act
+        summary = clean_summary_text("  A light\n   salad\t with herbs. ")
+
+        # Assert
+        assert summary == "A light salad with herbs."
+
+    def test_clean_summary_text_removes_bold_markers(self):
+        """Test cleaning a summary that contains bold markdown."""
+        # Act
+        summary = clean_summary_text("**Lemon\n tart**: a **zesty** dessert")
+
+        # Assert
+        assert summary == "Lemon tart: a zesty dessert"
+
+    def test_clean_summary_text_blank(self):
+        """Test cleaning a summary made only of whitespace."""
+        # Act
+        summary = clean_summary_text(" \n ")
+
+        # Assert
+        assert summary == ""
+
+    def test_manual_parse_response_number_styles(self, generator):
+        """Test manually parsing "N.", "N:" and "N)" items spanning several lines."""
+        # Arrange
+        response_text = (
+            "1. Fluffy pancakes\n"
+            "   with maple syrup.\n"
+            "\n"
+            "2: A **slow-cooked** stew.\n"
+            "3) Chilled soup."
+        )
+
+        # Act
+        summaries = generator.manual_parse_response(response_text, 3)
+
+        # Assert
+        assert summaries == [
+            "Fluffy pancakes with maple syrup.",
+            "A slow-cooked stew.",
+            "Chilled soup.",
+        ]
+
+    def test_manual_parse_response_number_on_own_line(self, generator):
+        """Test manually parsing items whose text starts after the number line."""
+        # Act
+        summaries = generator.manual_parse_response("1.\nPancakes.\n2.\nStew.", 2)
+
+        # Assert
+        assert summaries == ["Pancakes.", "Stew."]
+
+    def test_manual_parse_response_skips_introduction(self, generator):
+        """Test manually parsing a response that opens with introductory text."""
+        # Act
+        summaries = generator.manual_parse_response("Here are your summaries.\n1. Pancakes.", 1)
+
+        # Assert
+        assert summaries == ["Pancakes."]
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+# The service module imports the embedding and Qdrant libraries at load time
+pytest.importorskip("pydantic")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("qdrant_client")
+
+from models import RecipeRecommendation
+from services.vector_search_service import VectorSearchService
+
+
+def get_test_recommendation(recipe_id, score):
+    """
+    Return a test recommendation with the given ID and similarity score.
+    """
+    return RecipeRecommendation(
+        recipe_id=recipe_id,
+        title=f"Recipe {recipe_id}",
+        collection="quick-light",
+        similarity_score=score,
+        summary="",
+    )
+
+
+class TestVectorSearchService:
+    """Test suite for the VectorSearchService class."""
+
+    @pytest.fixture
+    def vector_service(self):
+        """Create a VectorSearchService that is not connected to Qdrant."""
+        return VectorSearchService()
+
+    @pytest.fixture
+    def batching_service(self):
+        """Create a VectorSearchService with a mocked model and a running embedding worker."""
+        with patch("services.vector_search_service.EMBEDDING_BATCH_WINDOW_SECONDS", 0.2):
+            service = VectorSearchService()
+            service.model = MagicMock()
+            service.model.encode.side_effect = lambda texts, **kwargs: np.array(
+                [[float(len(text)), 1.0] for text in texts], dtype=np.float32
+            )
+            service._start_embedding_worker()
+            yield service
+            service.close()
+
+    def test_merge_recommendations(self, vector_service):
+        """Test merging duplicate hits keeps the best score per recipe."""
+        # Arrange
+        hits = [
+            get_test_recommendation("1", 0.5),
+            get_test_recommendation("2", 0.9),
+            get_test_recommendation("1", 0.7),
+            get_test_recommendation("3", 0.6),
+            get_test_recommendation("2", 0.4),
+        ]
+
+        # Act
+        merged = vector_service.merge_recommendations(iter(hits))
+
+        # Assert
+        assert [(rec.recipe_id, rec.similarity_score) for rec in merged] == [
+            ("2", 0.9),
+            ("1", 0.7),
+            ("3", 0.6),
+        ]
+
+    def test_merge_recommendations_empty(self, vector_service):
+        """Test merging when no collection returned hits."""
+        # Act
+        merged = vector_service.merge_recommendations([])
+
+        # Assert
+        assert merged == []
+
+    def test_parse_list_literal_json(self):
+        """Test parsing an ingredient list stored as a JSON list."""
+        # Act
+        ingredients = VectorSearchService._parse_list_literal('["flour", "sugar"]')
+
+        # Assert
+        assert ingredients == ["flour", "sugar"]
+
+    def test_parse_list_literal_python_repr(self):
+        """Test parsing a single-quoted Python list with an embedded double quote."""
+        # Act
+        ingredients = VectorSearchService._parse_list_literal("['2 cups flour', 'a 9\" pan']")
+
+        # Assert
+        assert ingredients == ["2 cups flour", 'a 9" pan']
+
+    def test_parse_list_literal_unparsable(self):
+        """Test parsing a list that neither JSON nor literal_eval accepts."""
+        # Act
+        ingredients = VectorSearchService._parse_list_literal("[flour, 'sugar', \"eggs\"]")
+
+        # Assert
+        assert ingredients == ["flour", "sugar", "eggs"]
+
+    @pytest.mark.asyncio
+    async def test_embed_batches_concurrent_requests(self, batching_service):
+        """Test embedding concurrent requests in a single model call."""
+        # Act
+        first, second = await asyncio.gather(
+            batching_service.embed(["pasta", "soup"]),
+            batching_service.embed(["cake"]),
+        )
+
+        # Assert
+        batching_service.model.encode.assert_called_once()
+        assert batching_service.model.encode.call_args.args[0] == ["pasta", "soup", "cake"]
+        assert first == [[5.0, 1.0], [4.0, 1.0]]
+        assert second == [[4.0, 1.0]]
+
+    @pytest.mark.asyncio
+    async def test_embed_serves_cached_texts(self, batching_service):
+        """Test embedding a text that was embedded before."""
+        # Arrange
+        await batching_service.embed(["pasta"])
+
+        # Act
+        result = await batching_service.embed(["pasta", "salad"])
+
+        # Assert
+        assert [call.args[0] for call in batching_service.model.encode.call_args_list] == [["pasta"], ["salad"]]
+        assert result == [[5.0, 1.0], [5.0, 1.0]]
+
+    @pytest.mark.asyncio
+    async def test_embed_model_error(self, batching_service):
+        """Test embedding when the model fails for a whole batch."""
+        # Arrange
+        batching_service.model.encode.side_effect = ValueError("boom")
+
+        # Act
+        results = await asyncio.gather(
+            batching_service.embed(["pasta"]),
+            batching_service.embed(["cake"]),
+            return_exceptions=True,
+        )
+
+        # Assert
+        assert all(isinstance(result, RuntimeError) for result in results)
+        batching_service.model.encode.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_embedding_worker(self, batching_service):
+        """Test embedding after the worker has been stopped."""
+        # Arrange
+        workers = [thread for thread in threading.enumerate() if thread.name == "embedding-batcher"]
+
+        # Act
+        batching_service.close()
+        result = await batching_service.embed(["cake"])
+
+        # Assert
+        for worker in workers:
+            worker.join(timeout=1.0)
+        assert not any(worker.is_alive() for worker in workers)
+        assert result == [[4.0, 1.0]]
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Body
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 import logging
 import json
-from app.database import get_db
 from app.models import schemas
 from app.services.user_service import UserService
+from app.dependencies import get_user_service
 
 # Set up logging with more detail
 logger = logging.getLogger("user_controller")
@@ -22,7 +21,7 @@ router = APIRouter()
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register_user(
     request: Request,
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     try:
         # Log the request
@@ -76,7 +75,6 @@ async def register_user(
         
         # Create user
         try:
-            user_service = UserService(db)
             user = user_service.create_user(user_data)
             logger.info(f"User successfully created with email: {user.email}")
             
@@ -106,7 +104,7 @@ async def register_user(
 
 # Also add a simplified endpoint for debugging
 @router.post("/register/simple", status_code=status.HTTP_201_CREATED)
-def register_simple(user_data: Dict[str, Any] = Body(...), db: Session = Depends(get_db)):
+def register_simple(user_data: Dict[str, Any] = Body(...), user_service: UserService = Depends(get_user_service)):
     """Simple registration endpoint that uses Body(...) instead of Request to avoid body reading issues"""
     try:
         logger.debug(f"Simple register endpoint called with data: {user_data}")
@@ -143,7 +141,6 @@ def register_simple(user_data: Dict[str, Any] = Body(...), db: Session = Depends
         
         # Create user
         try:
-            user_service = UserService(db)
             user = user_service.create_user(user_create)
             logger.info(f"User successfully created with email: {user.email}")
             
@@ -182,29 +179,29 @@ async def debug_request(request: Request):
         return {"error": str(e)}
 
 @router.get("/", response_model=List[schemas.UserResponse])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = UserService(db).get_all_users(skip=skip, limit=limit)
+def get_users(skip: int = 0, limit: int = 100, user_service: UserService = Depends(get_user_service)):
+    users = user_service.get_all_users(skip=skip, limit=limit)
     return users
 
 @router.post("/", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+def create_user(user: schemas.UserCreate, user_service: UserService = Depends(get_user_service)):
     logger.info(f"Root POST endpoint called with user data: {user.email}")
     try:
-        return UserService(db).create_user(user)
+        return user_service.create_user(user)
     except ValueError as e:
         logger.error(f"User creation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = UserService(db).get_user_by_id(user_id)
+def get_user(user_id: int, user_service: UserService = Depends(get_user_service)):
+    user = user_service.get_user_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 @router.put("/{user_id}", response_model=schemas.UserResponse)
-def update_user(user_id: int, user_data: schemas.UserUpdate, db: Session = Depends(get_db)):
-    user = UserService(db).update_user(user_id, user_data)
+def update_user(user_id: int, user_data: schemas.UserUpdate, user_service: UserService = Depends(get_user_service)):
+    user = user_service.update_user(user_id, user_data)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -213,7 +210,7 @@ def update_user(user_id: int, user_data: schemas.UserUpdate, db: Session = Depen
 async def update_user_preferences(
     request: Request,
     user_id: int,
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Update user preferences with better error handling"""
     try:
@@ -247,7 +244,7 @@ async def update_user_preferences(
         
         # Update preferences
         try:
-            user = UserService(db).update_user_preferences(
+            user = user_service.update_user_preferences(
                 user_id,
                 allergies=allergies,
                 disliked_ingredients=disliked_ingredients,
@@ -294,16 +291,15 @@ async def debug_preferences_update(request: Request, user_id: int):
         return {"error": str(e)}
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    deleted = UserService(db).delete_user(user_id)
+def delete_user(user_id: int, user_service: UserService = Depends(get_user_service)):
+    deleted = user_service.delete_user(user_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
     return None
 
 @router.post("/login")
-def login(username: str, password: str, db: Session = Depends(get_db)):
+def login(username: str, password: str, user_service: UserService = Depends(get_user_service)):
     logger.debug(f"Login endpoint called for username: {username}")
-    user_service = UserService(db)
     user = user_service.authenticate_user(username, password)
     if not user:
         raise HTTPException(
@@ -315,7 +311,7 @@ def login(username: str, password: str, db: Session = Depends(get_db)):
 
 # Add enhanced login endpoint that accepts JSON body
 @router.post("/login/json", status_code=status.HTTP_200_OK)
-def login_json(login_data: Dict[str, Any] = Body(...), db: Session = Depends(get_db)):
+def login_json(login_data: Dict[str, Any] = Body(...), user_service: UserService = Depends(get_user_service)):
     try:
         # Log the raw request data for debugging
         logger.debug(f"Login JSON endpoint called")
@@ -336,7 +332,6 @@ def login_json(login_data: Dict[str, Any] = Body(...), db: Session = Depends(get
             )
         
         # Use the service to authenticate
-        user_service = UserService(db)
         user = user_service.authenticate_user(email, password)
         
         if user:
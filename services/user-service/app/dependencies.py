@@ -0,0 +1,9 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.services.user_service import UserService
+
+# Shared FastAPI dependencies; override them through app.dependency_overrides in tests
+def get_user_service(db: Session = Depends(get_db)) -> UserService:
+    """Build the request's UserService once; FastAPI caches it per request"""
+    return UserService(db)
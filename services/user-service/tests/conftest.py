@@ -0,0 +1,54 @@
+import os
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+import sys
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.database retries MySQL at import time and app.main creates the tables;
+# skip both so the app can be imported without a database
+with patch("time.sleep"), patch("sqlalchemy.MetaData.create_all"):
+    from app.main import app
+
+from app.dependencies import get_user_service
+
+
+@pytest.fixture(scope="function")
+def mock_user_service():
+    """
+    Mock the UserService so routes never reach the database.
+    """
+    return MagicMock()
+
+
+@pytest.fixture(scope="function")
+def client(mock_user_service):
+    """
+    Create a test client with get_user_service overridden by the mock.
+    """
+    app.dependency_overrides[get_user_service] = lambda: mock_user_service
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def get_test_user(user_id=1):
+    """
+    Return a test user matching the UserResponse schema.
+    """
+    return {
+        "id": user_id,
+        "email": "test@example.com",
+        "username": "testuser",
+        "full_name": "Test User",
+        "is_active": True,
+        "is_admin": False,
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+        "allergies": ["peanuts"],
+        "disliked_ingredients": [],
+        "preferred_cuisines": ["Italian"],
+        "preferences": {},
+    }
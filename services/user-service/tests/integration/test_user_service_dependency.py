@@ -0,0 +1,43 @@
+from tests.conftest import get_test_user
+
+
+class TestUserServiceDependency:
+    """Integration tests for overriding the get_user_service dependency."""
+
+    def test_get_user_uses_overridden_service(self, client, mock_user_service):
+        """Test fetching a user through the overridden UserService."""
+        # Arrange
+        mock_user_service.get_user_by_id.return_value = get_test_user(1)
+
+        # Act
+        response = client.get("/users/1")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["username"] == "testuser"
+        mock_user_service.get_user_by_id.assert_called_once_with(1)
+
+    def test_get_user_not_found(self, client, mock_user_service):
+        """Test fetching a missing user through the overridden UserService."""
+        # Arrange
+        mock_user_service.get_user_by_id.return_value = None
+
+        # Act
+        response = client.get("/users/999")
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json()["detail"] == "User not found"
+
+    def test_list_users_passes_pagination(self, client, mock_user_service):
+        """Test listing users passes skip and limit to the UserService."""
+        # Arrange
+        mock_user_service.get_all_users.return_value = [get_test_user(1), get_test_user(2)]
+
+        # Act
+        response = client.get("/users/?skip=5&limit=2")
+
+        # Assert
+        assert response.status_code == 200
+        assert [user["id"] for user in response.json()] == [1, 2]
+        mock_user_service.get_all_users.assert_called_once_with(skip=5, limit=2)